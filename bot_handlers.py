@@ -10,6 +10,9 @@ Provides inline keyboard interface for managing:
 """
 from __future__ import annotations
 
+import asyncio
+import functools
+import os
 import re
 
 from telethon import events, Button
@@ -95,19 +98,54 @@ _schedule_list_message_id: int | None = None  # Message ID of schedule list from
 _personal_id: int | None = None
 _personal_username: str | None = None
 
+# Set while the user client is authorized (owner known); created lazily on the running loop
+_authorized_event: asyncio.Event | None = None
+
 
 def _utf16_len(text: str) -> int:
     """Calculate length in UTF-16 code units (what Telegram uses for offsets)."""
     return len(text.encode('utf-16-le')) // 2
 
 
+def _first_custom_emoji(message) -> MessageEntityCustomEmoji | None:
+    """Return the first custom emoji entity of a message, or None."""
+    return next(
+        (e for e in (message.entities or ()) if isinstance(e, MessageEntityCustomEmoji)),
+        None
+    )
+
+
+def _get_authorized_event() -> asyncio.Event:
+    """Get the event that is set while the user client is authorized."""
+    global _authorized_event
+    if _authorized_event is None:
+        _authorized_event = asyncio.Event()
+    return _authorized_event
+
+
 def set_owner_id(user_id: int) -> None:
     """Set the owner user ID (from authorized user client)."""
     global _owner_id
     _owner_id = user_id
+    _get_authorized_event().set()
     logger.info(f"Bot owner set to user ID: {user_id}")
 
 
+async def wait_until_authorized() -> None:
+    """Wait until the user client is authorized and the owner is known."""
+    await _get_authorized_event().wait()
+
+
+def is_authorized() -> bool:
+    """Check whether the user client was marked as authorized."""
+    return _get_authorized_event().is_set()
+
+
+def clear_authorized() -> None:
+    """Mark the user client as no longer authorized (logout, revoked session)."""
+    _get_authorized_event().clear()
+
+
 def set_owner_username(username: str) -> None:
     """Set the owner username as fallback."""
     global _owner_username
@@ -224,9 +262,12 @@ def get_auth_cancel_keyboard():
     ]
 
 
+@functools.lru_cache(maxsize=2)
 def get_main_menu_keyboard(is_personal: bool = False):
     """Main menu keyboard.
 
+    The buttons are static, so both variants are built once and reused.
+
     Args:
         is_personal: If True, show limited menu for personal account
                     (features requiring user client are hidden)
@@ -638,20 +679,15 @@ def register_bot_handlers(bot, user_client=None):
         except Exception as e:
             logger.warning(f"Failed to clear bot chat history: {e}")
 
-    async def _is_user_client_authorized() -> bool:
+    def _is_user_client_authorized() -> bool:
         """Check if user client is authorized."""
-        if not _user_client:
-            return False
-        try:
-            return await _user_client.is_user_authorized()
-        except Exception:
-            return False
+        return _user_client is not None and is_authorized()
 
     @bot.on(events.NewMessage(pattern=r"^/start"))
     async def start_handler(event):
         """Handle /start command - show main menu or auth flow."""
         # Check if user client is authorized
-        is_authorized = await _is_user_client_authorized()
+        is_authorized = _is_user_client_authorized()
 
         if not is_authorized:
             # User client not authorized - show auth flow
@@ -2026,6 +2062,7 @@ def register_bot_handlers(bot, user_client=None):
         # Clear owner state
         _owner_id = None
         _owner_username = None
+        clear_authorized()
 
         # Disconnect client
         try:
@@ -2034,14 +2071,15 @@ def register_bot_handlers(bot, user_client=None):
             logger.warning(f"Disconnect error: {e}")
 
         # Delete session file to allow fresh authentication
-        import os
-        session_file = config.session_path + '.session'
-        if os.path.exists(session_file):
-            try:
-                os.remove(session_file)
-                logger.info(f"Session file deleted: {session_file}")
-            except Exception as e:
-                logger.warning(f"Failed to delete session file: {e}")
+        # (in a worker thread: the session may live on slow storage)
+        session_file = config.session_file
+        try:
+            await asyncio.to_thread(os.unlink, session_file)
+            logger.info(f"Session file deleted: {session_file}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to delete session file: {e}")
 
         # Reconnect client for future auth
         try:
@@ -2819,8 +2857,7 @@ def register_bot_handlers(bot, user_client=None):
 
         # Check if user is editing work schedule (time or emoji)
         if event.sender_id in _pending_work_time_edit:
-            entities = event.message.entities or []
-            custom_emojis = [e for e in entities if isinstance(e, MessageEntityCustomEmoji)]
+            custom_emoji = _first_custom_emoji(event.message)
             text = event.message.text.strip() if event.message.text else ""
 
             work = Schedule.get_work_schedule()
@@ -2833,8 +2870,8 @@ def register_bot_handlers(bot, user_client=None):
                 return
 
             # Check if user sent emoji
-            if custom_emojis:
-                emoji_id = custom_emojis[0].document_id
+            if custom_emoji is not None:
+                emoji_id = custom_emoji.document_id
                 work.emoji_id = str(emoji_id)
                 work.save()
                 _pending_work_time_edit.discard(event.sender_id)
@@ -2908,17 +2945,16 @@ def register_bot_handlers(bot, user_client=None):
 
         # Check if user is setting morning emoji
         if event.sender_id in _pending_morning_emoji:
-            entities = event.message.entities or []
-            custom_emojis = [e for e in entities if isinstance(e, MessageEntityCustomEmoji)]
+            custom_emoji = _first_custom_emoji(event.message)
 
-            if not custom_emojis:
+            if custom_emoji is None:
                 await event.respond(
                     "❌ Отправьте сообщение с кастомным эмодзи.",
                     buttons=[[Button.inline("❌ Отмена", b"schedule_morning_cancel")]]
                 )
                 return
 
-            emoji_id = custom_emojis[0].document_id
+            emoji_id = custom_emoji.document_id
             work = Schedule.get_work_schedule()
             work_start = work.time_start if work else "09:00"
 
@@ -2935,17 +2971,16 @@ def register_bot_handlers(bot, user_client=None):
 
         # Check if user is setting evening emoji
         if event.sender_id in _pending_evening_emoji:
-            entities = event.message.entities or []
-            custom_emojis = [e for e in entities if isinstance(e, MessageEntityCustomEmoji)]
+            custom_emoji = _first_custom_emoji(event.message)
 
-            if not custom_emojis:
+            if custom_emoji is None:
                 await event.respond(
                     "❌ Отправьте сообщение с кастомным эмодзи.",
                     buttons=[[Button.inline("❌ Отмена", b"schedule_evening_cancel")]]
                 )
                 return
 
-            emoji_id = custom_emojis[0].document_id
+            emoji_id = custom_emoji.document_id
             work = Schedule.get_work_schedule()
             work_end = work.time_end if work else "18:00"
 
@@ -2962,17 +2997,16 @@ def register_bot_handlers(bot, user_client=None):
 
         # Check if user is setting weekend emoji
         if event.sender_id in _pending_weekend_emoji:
-            entities = event.message.entities or []
-            custom_emojis = [e for e in entities if isinstance(e, MessageEntityCustomEmoji)]
+            custom_emoji = _first_custom_emoji(event.message)
 
-            if not custom_emojis:
+            if custom_emoji is None:
                 await event.respond(
                     "❌ Отправьте сообщение с кастомным эмодзи.",
                     buttons=[[Button.inline("❌ Отмена", b"schedule_weekend_cancel")]]
                 )
                 return
 
-            emoji_id = custom_emojis[0].document_id
+            emoji_id = custom_emoji.document_id
             work = Schedule.get_work_schedule()
             work_end = work.time_end if work else "18:00"
 
@@ -2989,17 +3023,16 @@ def register_bot_handlers(bot, user_client=None):
 
         # Check if user is setting rest emoji
         if event.sender_id in _pending_rest_emoji:
-            entities = event.message.entities or []
-            custom_emojis = [e for e in entities if isinstance(e, MessageEntityCustomEmoji)]
+            custom_emoji = _first_custom_emoji(event.message)
 
-            if not custom_emojis:
+            if custom_emoji is None:
                 await event.respond(
                     "❌ Отправьте сообщение с кастомным эмодзи.",
                     buttons=[[Button.inline("❌ Отмена", b"schedule_rest_cancel")]]
                 )
                 return
 
-            emoji_id = custom_emojis[0].document_id
+            emoji_id = custom_emoji.document_id
 
             Schedule.set_rest_emoji(emoji_id)
             _pending_rest_emoji.discard(event.sender_id)
@@ -3303,17 +3336,16 @@ def register_bot_handlers(bot, user_client=None):
 
         # Check if user is entering override emoji
         if event.sender_id in _pending_override_emoji:
-            entities = event.message.entities or []
-            custom_emojis = [e for e in entities if isinstance(e, MessageEntityCustomEmoji)]
+            custom_emoji = _first_custom_emoji(event.message)
 
-            if not custom_emojis:
+            if custom_emoji is None:
                 await event.respond(
                     "❌ Отправьте сообщение с кастомным эмодзи.",
                     buttons=[[Button.inline("❌ Отмена", b"schedule_override_cancel")]]
                 )
                 return
 
-            emoji_id = custom_emojis[0].document_id
+            emoji_id = custom_emoji.document_id
             date_start, time_start, date_end, time_end = _pending_override_emoji.pop(event.sender_id)
 
             Schedule.create_override(emoji_id, date_start, date_end, time_start, time_end)
@@ -3365,13 +3397,12 @@ def register_bot_handlers(bot, user_client=None):
 
         # Check if user is in "add mode" and message contains custom emoji
         if event.sender_id in _pending_reply_add_mode:
-            entities = event.message.entities or []
-            custom_emojis = [e for e in entities if isinstance(e, MessageEntityCustomEmoji)]
+            custom_emoji = _first_custom_emoji(event.message)
 
-            if custom_emojis:
+            if custom_emoji is not None:
                 # User sent emoji - store it for reply setup
                 _pending_reply_add_mode.discard(event.sender_id)
-                emoji_id = custom_emojis[0].document_id
+                emoji_id = custom_emoji.document_id
                 _pending_reply_setup[event.sender_id] = emoji_id
 
                 await event.respond(
@@ -3750,9 +3781,7 @@ def register_bot_handlers(bot, user_client=None):
 
             # Get extra chat IDs for muted chats user wants to include
             # Combine permanent extra chats + temporary chats (from mentions/replies)
-            extra_chat_ids = Settings.get_productivity_extra_chats()
-            temp_chat_ids = Settings.get_productivity_temp_chats()
-            all_extra_chats = list(set(extra_chat_ids + temp_chat_ids))
+            all_extra_chats = Settings.get_productivity_all_chats()
 
             # Collect messages (this may take a while)
             daily = await service.collect_daily_messages(
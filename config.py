@@ -4,9 +4,14 @@ Centralized configuration for telegram-assistant.
 All configuration values are loaded from environment variables with sensible defaults.
 """
 import os
+import re
 from dataclasses import dataclass, field
 from typing import Optional
 
+# Credential formats, checked before any connection is attempted
+_API_HASH_RE = re.compile(r'[0-9a-fA-F]{32}')
+_BOT_TOKEN_RE = re.compile(r'\d+:[A-Za-z0-9_-]{30,}')
+
 
 @dataclass
 class Config:
@@ -131,6 +136,27 @@ class Config:
     caldav_check_interval: int = field(
         default_factory=lambda: int(os.environ.get('CALDAV_CHECK_INTERVAL', '60'))
     )
+    # Bounds on the wait until the next known event start/end
+    caldav_check_interval_min: int = field(
+        default_factory=lambda: int(os.environ.get('CALDAV_CHECK_INTERVAL_MIN', '1'))
+    )
+    caldav_check_interval_max: int = field(
+        default_factory=lambda: int(os.environ.get('CALDAV_CHECK_INTERVAL_MAX', '300'))
+    )
+    # How long a fetched calendar status is trusted when no event start/end
+    # falls in between, i.e. how late a newly created event may be noticed
+    caldav_status_max_age: int = field(
+        default_factory=lambda: int(os.environ.get('CALDAV_STATUS_MAX_AGE', '60'))
+    )
+    # Timeout for each CalDAV HTTP request, in seconds
+    caldav_timeout: int = field(
+        default_factory=lambda: int(os.environ.get('CALDAV_TIMEOUT', '15'))
+    )
+
+    @property
+    def session_file(self) -> str:
+        """Path of the Telethon session file (Telethon appends '.session')."""
+        return self.session_path + '.session'
 
     def validate(self) -> list[str]:
         """Validate required configuration. Returns list of error messages."""
@@ -139,8 +165,12 @@ class Config:
             errors.append("API_ID is required")
         if not self.api_hash:
             errors.append("API_HASH is required")
+        elif not _API_HASH_RE.fullmatch(self.api_hash):
+            errors.append("API_HASH must be 32 hex characters")
         if not self.personal_tg_login:
             errors.append("PERSONAL_TG_LOGIN is required")
+        if self.bot_token and not _BOT_TOKEN_RE.fullmatch(self.bot_token):
+            errors.append("BOT_TOKEN must look like '<bot id>:<secret>' (from @BotFather)")
         return errors
 
     def is_valid(self) -> bool:
@@ -5,16 +5,20 @@ Handles incoming messages for auto-reply and ASAP notifications.
 All configuration is done via the bot interface (bot_handlers.py).
 """
 import asyncio
+import logging
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from telethon import events
 from telethon.errors import ReactionInvalidError
 from telethon.tl import types
+from telethon.tl.functions.account import UpdateEmojiStatusRequest
 from telethon.tl.functions.messages import SendReactionRequest, GetPeerDialogsRequest
-from telethon.tl.types import MessageEntityCustomEmoji
+from telethon.tl.types import EmojiStatus, MessageEntityCustomEmoji
 
+from bot_handlers import get_owner_id, get_personal_id
 from config import config
 from logging_config import logger
 from models import DEFAULT_REPLY_EMOJI, Reply, Settings, VipList
@@ -56,7 +60,138 @@ class PendingMention:
 
 # Storage for pending mentions (key: "chat_id:message_id")
 _pending_mentions: Dict[str, PendingMention] = {}
-_pending_checker_started = False
+
+# Set once start_background_workers() has started the checker and ASAP workers
+_workers_started = False
+
+# Resolved InputPeer per chat_id, so reactions skip get_input_chat() lookups
+_INPUT_PEER_CACHE_SIZE = 1024
+_input_peer_cache: "OrderedDict[int, Any]" = OrderedDict()
+
+# ASAP follow-ups (webhook call, reaction) run on a few workers instead of in
+# the handler, so a slow webhook doesn't hold up the other handlers for the
+# same message. Items are (event, sender_username, sender_id, webhook_url).
+ASAP_QUEUE_SIZE = 500
+ASAP_WORKERS = 4
+_asap_queue: Optional[asyncio.Queue] = None
+
+# Last outgoing message per private chat for the auto-reply rate limit. Kept
+# current by HandlerRegistry.track_outgoing, so history is only fetched the
+# first time a chat is seen (None: no recent outgoing message).
+_LAST_OUTGOING_CACHE_SIZE = 1024
+_last_outgoing: "OrderedDict[int, Any]" = OrderedDict()
+
+# Reaction payloads per emoticon; the set of reactions we send is tiny and fixed
+_reactions: Dict[str, list] = {}
+
+# How long a get_me() result is reused, in seconds. Our own profile/emoji
+# status updates drop it earlier (see HandlerRegistry.own_user_updated).
+ME_CACHE_TTL = 60
+
+# Last client.get_me() result and the loop time it was fetched at
+_me_cache = None
+
+# Re-read our emoji status from Telegram at least this often, in seconds
+EMOJI_REFRESH_SECONDS = 3600
+
+# Emoji status document ID we last set or read and the loop time of that
+# (None: unknown). Dropped with the get_me() cache, so status changes made
+# elsewhere (e.g. in the Telegram app) are picked up via own_user_updated.
+_emoji_status = None
+# Serializes emoji status updates (created lazily on the running loop)
+_emoji_lock: Optional[asyncio.Lock] = None
+
+
+async def get_me_cached(client, ttl: float = ME_CACHE_TTL):
+    """Get the current user, reusing the last get_me() result for up to ttl seconds."""
+    global _me_cache
+    now = asyncio.get_running_loop().time()
+    if _me_cache is not None and now - _me_cache[1] < ttl:
+        return _me_cache[0]
+    me = await client.get_me()
+    _me_cache = (me, now)
+    return me
+
+
+def invalidate_me_cache():
+    """Force the next get_me_cached() call to fetch fresh data (e.g. after a status change)."""
+    global _me_cache, _emoji_status
+    _me_cache = None
+    _emoji_status = None
+
+
+async def get_emoji_status(client, max_age: float = EMOJI_REFRESH_SECONDS) -> Optional[int]:
+    """
+    Get our current emoji status document ID.
+
+    Uses the status last set or read unless it is unknown or older than
+    max_age seconds, in which case it is re-read from Telegram.
+    """
+    global _emoji_status
+    now = asyncio.get_running_loop().time()
+    if _emoji_status is not None and now - _emoji_status[1] < max_age:
+        return _emoji_status[0]
+    me = await get_me_cached(client, ttl=0)
+    document_id = me.emoji_status.document_id if me.emoji_status else None
+    _emoji_status = (document_id, now)
+    return document_id
+
+
+async def set_emoji_status(client, document_id: int) -> None:
+    """
+    Set our emoji status and remember it as the current one.
+
+    All status changes go through here. Does nothing if the status is
+    already known to be document_id. Raises whatever UpdateEmojiStatusRequest
+    raises; callers log failures.
+    """
+    global _emoji_status, _emoji_lock
+    if _emoji_lock is None:
+        _emoji_lock = asyncio.Lock()
+    async with _emoji_lock:
+        if _emoji_status is not None and _emoji_status[0] == document_id:
+            logger.debug("Emoji status already %s, skipping update", document_id)
+            return
+        await client(UpdateEmojiStatusRequest(
+            emoji_status=EmojiStatus(document_id=document_id)
+        ))
+        invalidate_me_cache()
+        _emoji_status = (document_id, asyncio.get_running_loop().time())
+
+
+def _own_user_update_types() -> tuple:
+    """Raw update types that report changes to a user's profile or emoji status."""
+    # UpdateUserEmojiStatus only exists in newer layers; older ones send UpdateUser
+    emoji_status_update = getattr(types, 'UpdateUserEmojiStatus', None)
+    if emoji_status_update is None:
+        return (types.UpdateUser,)
+    return (types.UpdateUser, emoji_status_update)
+
+
+def _is_private_asap(event) -> bool:
+    """Event filter: private message containing the ASAP keyword (any case)."""
+    return event.is_private and 'asap' in (event.raw_text or '').lower()
+
+
+def _get_asap_queue() -> asyncio.Queue:
+    """Get the ASAP follow-up queue (created lazily on the running loop)."""
+    global _asap_queue
+    if _asap_queue is None:
+        _asap_queue = asyncio.Queue(maxsize=ASAP_QUEUE_SIZE)
+    return _asap_queue
+
+
+def _remember_outgoing(chat_id: int, message) -> None:
+    """Record the last outgoing message of a private chat."""
+    _last_outgoing[chat_id] = message
+    _last_outgoing.move_to_end(chat_id)
+    if len(_last_outgoing) > _LAST_OUTGOING_CACHE_SIZE:
+        _last_outgoing.popitem(last=False)
+
+
+async def close_notification_service() -> None:
+    """Close the webhook HTTP session of the notification service."""
+    await _notification_service.close()
 
 
 def _is_user_mentioned(message, user_id: int, username: str = None) -> bool:
@@ -171,7 +306,7 @@ async def _get_reply_chain(client, chat_id: int, message, max_depth: int = 5) ->
             else:
                 break
         except Exception as e:
-            logger.warning(f"Failed to fetch reply message {reply_to_id}: {e}")
+            logger.warning("Failed to fetch reply message %s: %s", reply_to_id, e)
             break
 
     # Reverse to get chronological order (oldest first)
@@ -200,12 +335,12 @@ async def _is_message_read(client, chat_id: int, message_id: int) -> bool:
         if result.dialogs:
             dialog = result.dialogs[0]
             read_inbox_max_id = dialog.read_inbox_max_id
-            logger.debug(f"Chat {chat_id}: read_inbox_max_id={read_inbox_max_id}, message_id={message_id}")
+            logger.debug("Chat %s: read_inbox_max_id=%s, message_id=%s", chat_id, read_inbox_max_id, message_id)
             return message_id <= read_inbox_max_id
 
         return False
     except Exception as e:
-        logger.warning(f"Failed to check if message {message_id} in chat {chat_id} was read: {e}")
+        logger.warning("Failed to check if message %s in chat %s was read: %s", message_id, chat_id, e)
         return False
 
 
@@ -217,12 +352,6 @@ async def _process_pending_mentions():
     - If scheduled time has passed and message not read -> send notification
     - If message was read -> remove from pending
     """
-    global _pending_checker_started
-
-    if _pending_checker_started:
-        return
-
-    _pending_checker_started = True
     logger.info("Starting pending mentions checker...")
 
     while True:
@@ -250,8 +379,9 @@ async def _process_pending_mentions():
 
                     if was_read:
                         logger.info(
-                            f"Mention in '{mention.chat_title}' from {mention.sender_name} "
-                            f"was read, skipping notification"
+                            "Mention in '%s' from %s "
+                            "was read, skipping notification",
+                            mention.chat_title, mention.sender_name
                         )
                         to_remove.append(key)
                         continue
@@ -259,7 +389,6 @@ async def _process_pending_mentions():
                 # Message not read, send notification via bot
                 if _bot_client:
                     try:
-                        from bot_handlers import get_owner_id
                         owner_id = get_owner_id()
                         if owner_id:
                             await _bot_client.send_message(
@@ -268,11 +397,12 @@ async def _process_pending_mentions():
                                 silent=not mention.is_urgent
                             )
                             logger.info(
-                                f"Delayed mention notification sent for '{mention.chat_title}' "
-                                f"(urgent={mention.is_urgent})"
+                                "Delayed mention notification sent for '%s' "
+                                "(urgent=%s)",
+                                mention.chat_title, mention.is_urgent
                             )
                     except Exception as e:
-                        logger.error(f"Failed to send delayed notification: {e}")
+                        logger.error("Failed to send delayed notification: %s", e)
 
                 to_remove.append(key)
 
@@ -284,7 +414,7 @@ async def _process_pending_mentions():
             logger.info("Pending mentions checker stopped")
             break
         except Exception as e:
-            logger.error(f"Error in pending mentions checker: {e}")
+            logger.error("Error in pending mentions checker: %s", e)
 
 
 def _schedule_pending_mention(
@@ -320,8 +450,9 @@ def _schedule_pending_mention(
     )
 
     logger.info(
-        f"Scheduled mention notification for '{chat_title}' from {sender_name} "
-        f"in {delay_minutes} minutes"
+        "Scheduled mention notification for '%s' from %s "
+        "in %s minutes",
+        chat_title, sender_name, delay_minutes
     )
 
 
@@ -347,7 +478,6 @@ async def _send_bot_notification(
         logger.warning("Bot client not available for notification")
         return False
 
-    from bot_handlers import get_owner_id, get_personal_id
     owner_id = get_owner_id()
     if not owner_id:
         logger.warning("Owner ID not available for notification")
@@ -372,32 +502,57 @@ async def _send_bot_notification(
                 )
                 logger.info("Notification duplicated to personal account")
             except Exception as e:
-                logger.warning(f"Failed to duplicate notification to personal account: {e}")
+                logger.warning("Failed to duplicate notification to personal account: %s", e)
 
     return True
 
 
-def register_handlers(client, bot=None):
+class HandlerRegistry:
     """
-    Register all Telegram event handlers on the client.
+    User-client event handlers, registered as bound methods.
 
     Args:
         client: Telethon client instance
-        bot: Telethon bot client for sending online mention notifications
     """
-    global _bot_client, _user_client
-    _bot_client = bot
-    _user_client = client
-
-    # Start background task for pending mentions
-    asyncio.get_event_loop().create_task(_process_pending_mentions())
 
-    @client.on(events.NewMessage(outgoing=True))
-    async def debug_outgoing(event):
+    def __init__(self, client):
+        self.client = client
+
+    def register(self) -> None:
+        """Register all handlers on the client."""
+        client = self.client
+        # Outgoing messages are only observed for debug logging; skip the
+        # handler entirely unless DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            client.add_event_handler(self.debug_outgoing, events.NewMessage(outgoing=True))
+        client.add_event_handler(
+            self.track_outgoing, events.NewMessage(outgoing=True, func=lambda e: e.is_private)
+        )
+        client.add_event_handler(self.asap_handler, events.NewMessage(incoming=True, func=_is_private_asap))
+        # Chat type is filtered at dispatch, so handlers never start for chats they ignore
+        private = events.NewMessage(incoming=True, func=lambda e: e.is_private)
+        group = events.NewMessage(incoming=True, func=lambda e: not e.is_private)
+        client.add_event_handler(self.vip_private_message_handler, private)
+        client.add_event_handler(self.reply_to_my_message_handler, group)
+        client.add_event_handler(self.group_mention_handler, group)
+        client.add_event_handler(self.new_messages, private)
+        client.add_event_handler(self.own_user_updated, events.Raw(_own_user_update_types()))
+
+    async def own_user_updated(self, update):
+        """Drop the cached get_me() result and emoji status when our own user changes."""
+        if update.user_id == get_owner_id():
+            invalidate_me_cache()
+
+    async def track_outgoing(self, event):
+        """Remember our last message per private chat for auto-reply rate limiting."""
+        _remember_outgoing(event.chat_id, event.message)
+
+    async def debug_outgoing(self, event):
         """Log all outgoing messages for debugging."""
-        logger.debug(f"Outgoing: '{event.message.text}' in chat {event.chat_id}")
+        logger.debug("Outgoing: %r in chat %s", event.message.text, event.chat_id)
 
     async def _send_asap_notification(
+        self,
         event,
         sender,
         sender_username: Optional[str],
@@ -427,31 +582,23 @@ def register_handlers(client, bot=None):
 
         log_type = "VIP" if is_vip else "ASAP"
         if sent:
-            logger.info(f"{log_type} notification sent via bot for message from {sender_username or sender_id}")
+            logger.info("%s notification sent via bot for message from %s", log_type, sender_username or sender_id)
         else:
-            logger.warning(f"Failed to send {log_type} notification via bot for {sender_username or sender_id}")
+            logger.warning("Failed to send %s notification via bot for %s", log_type, sender_username or sender_id)
 
         # Record notification time for cooldown
         _notification_service.record_asap_notification(sender_id)
 
-        # Call webhook if configured (prefer Settings, fallback to config)
+        # Webhook (prefer Settings, fallback to config) and reaction run on the
+        # ASAP workers
         webhook_url = Settings.get_asap_webhook_url() or config.asap_webhook_url
-        if webhook_url:
-            await _notification_service.call_webhook(
-                sender_username=sender_username,
-                sender_id=sender_id,
-                message_text=event.message.text or '',
-                webhook_url=webhook_url
-            )
-
-        await _send_reaction(client, event, '\U0001fae1')  # 🫡
+        try:
+            _get_asap_queue().put_nowait((event, sender_username, sender_id, webhook_url))
+        except asyncio.QueueFull:
+            logger.warning("ASAP follow-up queue full, skipping webhook/reaction for %s", sender_id)
 
-    @client.on(events.NewMessage(incoming=True, pattern=".*[Aa][Ss][Aa][Pp].*"))
-    async def asap_handler(event):
+    async def asap_handler(self, event):
         """Handle incoming messages with ASAP keyword."""
-        if not event.is_private:
-            return
-
         # Check if ASAP notifications are enabled in settings
         if not Settings.is_asap_enabled():
             return
@@ -469,29 +616,25 @@ def register_handlers(client, bot=None):
 
         # Check cooldown
         if not _notification_service.check_asap_cooldown(sender_id):
-            logger.debug(f"ASAP notification skipped due to cooldown for sender {sender_id}")
+            logger.debug("ASAP notification skipped due to cooldown for sender %s", sender_id)
             return
 
-        me = await client.get_me()
+        me = await get_me_cached(self.client)
         emoji_status_id = me.emoji_status.document_id if me.emoji_status else None
 
         if not _notification_service.should_notify_asap(
             message_text=event.message.text or '',
-            is_private=event.is_private,
+            is_private=True,
             emoji_status_id=emoji_status_id
         ):
             return
 
         sender_username = getattr(sender, 'username', None)
 
-        await _send_asap_notification(event, sender, sender_username, sender_id, is_vip=False)
+        await self._send_asap_notification(event, sender, sender_username, sender_id, is_vip=False)
 
-    @client.on(events.NewMessage(incoming=True))
-    async def vip_private_message_handler(event):
+    async def vip_private_message_handler(self, event):
         """Handle private messages from VIP users as ASAP."""
-        if not event.is_private:
-            return
-
         # Check if VIP-as-ASAP is enabled
         if not Settings.is_vip_as_asap_enabled():
             return
@@ -529,10 +672,10 @@ def register_handlers(client, bot=None):
 
         # Check cooldown
         if not _notification_service.check_asap_cooldown(sender_id):
-            logger.debug(f"VIP notification skipped due to cooldown for sender {sender_id}")
+            logger.debug("VIP notification skipped due to cooldown for sender %s", sender_id)
             return
 
-        me = await client.get_me()
+        me = await get_me_cached(self.client)
         emoji_status_id = me.emoji_status.document_id if me.emoji_status else None
 
         # Use the same availability check as ASAP
@@ -543,16 +686,11 @@ def register_handlers(client, bot=None):
         ):
             return
 
-        logger.info(f"VIP private message from @{sender_username}, treating as ASAP")
-        await _send_asap_notification(event, sender, sender_username, sender_id, is_vip=True)
+        logger.info("VIP private message from @%s, treating as ASAP", sender_username)
+        await self._send_asap_notification(event, sender, sender_username, sender_id, is_vip=True)
 
-    @client.on(events.NewMessage(incoming=True))
-    async def reply_to_my_message_handler(event):
+    async def reply_to_my_message_handler(self, event):
         """Track replies to user's messages for productivity summary."""
-        # Only group chats
-        if event.is_private:
-            return
-
         # Check if this is a reply to some message
         reply_to_id = getattr(event.message, 'reply_to_msg_id', None)
         if not reply_to_id:
@@ -566,29 +704,27 @@ def register_handlers(client, bot=None):
 
         # Get the original message being replied to
         try:
-            original_msg = await client.get_messages(event.chat_id, ids=reply_to_id)
+            original_msg = await self.client.get_messages(event.chat_id, ids=reply_to_id)
             if not original_msg:
                 return
 
             # Check if the original message was sent by me
-            me = await client.get_me()
+            me = await get_me_cached(self.client)
             if original_msg.sender_id == me.id:
                 # Someone replied to my message - add to productivity temp chats
                 Settings.add_productivity_temp_chat(event.chat_id)
-                logger.debug(f"Added chat {event.chat_id} to productivity temp list (reply to my message)")
+                logger.debug("Added chat %s to productivity temp list (reply to my message)", event.chat_id)
         except Exception as e:
-            logger.debug(f"Could not check reply origin: {e}")
+            logger.debug("Could not check reply origin: %s", e)
 
-    @client.on(events.NewMessage(incoming=True))
-    async def group_mention_handler(event):
+    async def group_mention_handler(self, event):
         """Handle mentions in group chats - notify both when online and offline."""
-        # Only group chats (not private)
-        if event.is_private:
-            return
+        message = event.message
+        chat_id = event.chat_id
 
         # Check if this message mentions the current user
-        me = await client.get_me()
-        if not _is_user_mentioned(event.message, me.id, me.username):
+        me = await get_me_cached(self.client)
+        if not _is_user_mentioned(message, me.id, me.username):
             return
 
         # Check if user is "online" (has available/work emoji)
@@ -617,11 +753,11 @@ def register_handlers(client, bot=None):
         sender_name = _get_display_name(sender)
         sender_username = getattr(sender, 'username', None)
 
-        logger.info(f"Mention detected in '{chat_title}' from {sender_name} (online={is_online})")
+        logger.info("Mention detected in '%s' from %s (online=%s)", chat_title, sender_name, is_online)
 
         # Add chat to temporary productivity list (will be cleared after daily summary)
-        Settings.add_productivity_temp_chat(event.chat_id)
-        logger.debug(f"Added chat {event.chat_id} to productivity temp list (mention)")
+        Settings.add_productivity_temp_chat(chat_id)
+        logger.debug("Added chat %s to productivity temp list (mention)", chat_id)
 
         # Use context extraction service for smart context fetching
         context_service = get_context_extraction_service()
@@ -629,65 +765,68 @@ def register_handlers(client, bot=None):
         # Extract context using anchor-based logic
         try:
             extracted_context = await context_service.extract_context(
-                client=client,
-                chat_id=event.chat_id,
-                mention_message=event.message,
+                client=self.client,
+                chat_id=chat_id,
+                mention_message=message,
                 message_limit=200  # Fetch more messages for anchor-based filtering
             )
             logger.info(
-                f"Extracted context: {extracted_context.total_messages} messages, "
-                f"span={extracted_context.time_span_minutes:.1f}min, "
-                f"has_reply_chain={extracted_context.has_reply_chain}"
+                "Extracted context: %s messages, "
+                "span=%.1fmin, "
+                "has_reply_chain=%s",
+                extracted_context.total_messages,
+                extracted_context.time_span_minutes,
+                extracted_context.has_reply_chain
             )
         except Exception as e:
-            logger.warning(f"Context extraction failed, using fallback: {e}")
+            logger.warning("Context extraction failed, using fallback: %s", e)
             extracted_context = None
 
         # Fallback: fetch recent messages manually
         if extracted_context is None:
             try:
-                messages = await client.get_messages(
-                    event.chat_id,
+                messages = await self.client.get_messages(
+                    chat_id,
                     limit=_mention_service.message_limit
                 )
                 messages = _mention_service.filter_messages_by_time(messages)
             except Exception as e:
-                logger.warning(f"Failed to fetch messages for context: {e}")
-                messages = [event.message]
+                logger.warning("Failed to fetch messages for context: %s", e)
+                messages = [message]
         else:
             # Convert extracted context to message list for legacy compatibility
-            messages = [event.message]
+            messages = [message]
 
         # Fetch reply chain for fallback path (if not using extracted context)
         reply_chain = []
-        if extracted_context is None and event.message.reply_to_msg_id:
+        if extracted_context is None and message.reply_to_msg_id:
             try:
-                reply_chain = await _get_reply_chain(client, event.chat_id, event.message, max_depth=5)
+                reply_chain = await _get_reply_chain(self.client, chat_id, message, max_depth=5)
                 if reply_chain:
-                    logger.debug(f"Found reply chain with {len(reply_chain)} messages")
+                    logger.debug("Found reply chain with %s messages", len(reply_chain))
             except Exception as e:
-                logger.warning(f"Failed to fetch reply chain: {e}")
+                logger.warning("Failed to fetch reply chain: %s", e)
 
         # Generate summary (try AI first, fallback to keywords)
         summary, ai_urgency = await _mention_service.generate_summary_with_ai(
-            messages, event.message, chat_title,
+            messages, message, chat_title,
             reply_chain=reply_chain,
             extracted_context=extracted_context
         )
 
         # Check urgency: VIP sender/chat always urgent, then AI, then keywords
         is_vip_sender = _mention_service.is_vip_sender(sender_username)
-        is_vip_chat = _mention_service.is_vip_chat(event.chat_id)
+        is_vip_chat = _mention_service.is_vip_chat(chat_id)
         is_vip = is_vip_sender or is_vip_chat
         if is_vip:
             is_urgent = True
             if is_vip_sender:
-                logger.debug(f"Urgency from VIP sender: {sender_username}")
+                logger.debug("Urgency from VIP sender: %s", sender_username)
             else:
-                logger.debug(f"Urgency from VIP chat: {event.chat_id}")
+                logger.debug("Urgency from VIP chat: %s", chat_id)
         elif ai_urgency is not None:
             is_urgent = ai_urgency
-            logger.debug(f"Urgency from AI: {is_urgent}")
+            logger.debug("Urgency from AI: %s", is_urgent)
         else:
             # Use extracted context messages for keyword-based urgency check
             if extracted_context and extracted_context.messages:
@@ -700,7 +839,7 @@ def register_handlers(client, bot=None):
                 is_urgent = _mention_service.is_urgent(context_msgs)
             else:
                 is_urgent = _mention_service.is_urgent(messages)
-            logger.debug(f"Urgency from keywords: {is_urgent}")
+            logger.debug("Urgency from keywords: %s", is_urgent)
 
         # Format notification with online/offline indicator
         if is_online:
@@ -710,12 +849,12 @@ def register_handlers(client, bot=None):
 
         notification = _mention_service.format_notification(
             chat_title=chat_title,
-            chat_id=event.chat_id,
+            chat_id=chat_id,
             sender_name=sender_name,
             sender_username=sender_username,
             summary=summary,
             is_urgent=is_urgent,
-            message_id=event.message.id
+            message_id=message.id
         )
 
         # Add online indicator to notification header
@@ -732,7 +871,6 @@ def register_handlers(client, bot=None):
             if is_online and _bot_client:
                 if is_vip:
                     # VIP mentions are always sent immediately via bot to owner
-                    from bot_handlers import get_owner_id
                     owner_id = get_owner_id()
                     if owner_id:
                         await _bot_client.send_message(
@@ -740,12 +878,12 @@ def register_handlers(client, bot=None):
                             notification,
                             silent=False  # VIP is always loud
                         )
-                        logger.info(f"VIP mention notification sent immediately via bot")
+                        logger.info("VIP mention notification sent immediately via bot")
                 else:
                     # Non-VIP online mentions: schedule with delay
                     _schedule_pending_mention(
-                        chat_id=event.chat_id,
-                        message_id=event.message.id,
+                        chat_id=chat_id,
+                        message_id=message.id,
                         notification=notification,
                         is_urgent=is_urgent,
                         chat_title=chat_title,
@@ -759,18 +897,14 @@ def register_handlers(client, bot=None):
                     silent=not is_urgent
                 )
                 if sent:
-                    logger.info(f"Mention notification sent via bot (offline, urgent={is_urgent})")
+                    logger.info("Mention notification sent via bot (offline, urgent=%s)", is_urgent)
                 else:
                     logger.warning("Failed to send offline mention notification via bot")
         except Exception as e:
-            logger.error(f"Failed to send mention notification: {e}")
+            logger.error("Failed to send mention notification: %s", e)
 
-    @client.on(events.NewMessage(incoming=True))
-    async def new_messages(event):
+    async def new_messages(self, event):
         """Handle incoming messages for auto-reply."""
-        if not event.is_private:
-            return
-
         # Check if autoreply is enabled
         if not Settings.is_autoreply_enabled():
             return
@@ -779,7 +913,7 @@ def register_handlers(client, bot=None):
         if getattr(sender, 'bot', False):
             return
 
-        me = await client.get_me()
+        me = await get_me_cached(self.client)
         emoji_status_id = me.emoji_status.document_id if me.emoji_status else None
 
         if emoji_status_id is not None:
@@ -787,6 +921,14 @@ def register_handlers(client, bot=None):
         else:
             reply = Reply.get_by_emoji(DEFAULT_REPLY_EMOJI)
 
+        # Cheap checks first: skip the history request when no reply can fire
+        if not _autoreply_service.can_reply(emoji_status_id, reply_exists=reply is not None):
+            return
+
+        message = reply.message
+        if message is None:
+            return
+
         sender_username = getattr(sender, 'username', None)
         sender_id = getattr(sender, 'id', 0)
 
@@ -797,45 +939,116 @@ def register_handlers(client, bot=None):
             return
 
         # Get last outgoing message for rate limiting
+        chat_id = event.chat_id
+        if chat_id in _last_outgoing:
+            last_outgoing = _last_outgoing[chat_id]
+        else:
+            try:
+                messages = await self.client.get_messages(user_identifier, limit=10)
+                last_outgoing = next((m for m in messages if m.out), None)
+            except Exception as e:
+                logger.warning("Could not get messages for rate limiting: %s", e)
+                last_outgoing = None
+            else:
+                _remember_outgoing(chat_id, last_outgoing)
+
+        if not _autoreply_service.check_rate_limit(last_outgoing):
+            logger.debug("Rate limit not met, skipping auto-reply")
+            return
+
+        sent = await self.client.send_message(user_identifier, message=message)
+        _remember_outgoing(chat_id, sent)
+        logger.info("Auto-reply sent to %s", user_identifier)
+
+
+async def _asap_worker():
+    """Background worker that runs queued ASAP follow-ups (webhook call, reaction)."""
+    queue = _get_asap_queue()
+    while True:
+        event, sender_username, sender_id, webhook_url = await queue.get()
         try:
-            messages = await client.get_messages(user_identifier, limit=10)
-            last_outgoing = next((m for m in messages if m.out), None)
+            if webhook_url:
+                await _notification_service.call_webhook(
+                    sender_username=sender_username,
+                    sender_id=sender_id,
+                    message_text=event.message.text or '',
+                    webhook_url=webhook_url
+                )
+            await _send_reaction(_user_client, event, '\U0001fae1')  # 🫡
         except Exception as e:
-            logger.warning(f"Could not get messages for rate limiting: {e}")
-            last_outgoing = None
+            logger.error("ASAP follow-up failed for %s: %s", sender_id, e)
+        finally:
+            queue.task_done()
 
-        if not _autoreply_service.should_send_reply(
-            emoji_status_id=emoji_status_id,
-            reply_exists=reply is not None,
-            last_outgoing_message=last_outgoing
-        ):
-            return
 
-        message = reply.message if reply else None
-        if message is None:
-            return
+def register_handlers(client, bot=None):
+    """
+    Register all Telegram event handlers on the client.
+
+    Args:
+        client: Telethon client instance
+        bot: Telethon bot client for sending online mention notifications
+    """
+    global _bot_client, _user_client
+    _bot_client = bot
+    _user_client = client
+
+    HandlerRegistry(client).register()
 
-        await client.send_message(user_identifier, message=message)
-        logger.info(f"Auto-reply sent to {user_identifier}")
+
+def start_background_workers(start_task) -> None:
+    """
+    Start the pending-mentions checker and the ASAP workers.
+
+    Only the first call starts anything, so the workers never double up on
+    the same queue.
+
+    Args:
+        start_task: Callable that schedules a coroutine as a task the caller
+            keeps track of (and cancels on shutdown)
+    """
+    global _workers_started
+    if _workers_started:
+        return
+    _workers_started = True
+
+    # Pending mention notifications
+    start_task(_process_pending_mentions())
+
+    # Workers for ASAP webhook calls and reactions
+    for _ in range(ASAP_WORKERS):
+        start_task(_asap_worker())
 
 
 async def _send_reaction(client, event, emoticon: str) -> None:
     """Send a reaction to a message, handling errors gracefully."""
+    chat_id = event.chat_id
     try:
-        # Use get_input_chat() for incoming messages where input_chat may be None
-        input_chat = event.input_chat
-        if input_chat is None:
-            input_chat = await event.get_input_chat()
-        if input_chat is None:
-            logger.debug(f"Cannot get input_chat for reaction in chat {event.chat_id}")
-            return
+        input_chat = _input_peer_cache.get(chat_id)
+        if input_chat is not None:
+            _input_peer_cache.move_to_end(chat_id)
+        else:
+            # Use get_input_chat() for incoming messages where input_chat may be None
+            input_chat = event.input_chat
+            if input_chat is None:
+                input_chat = await event.get_input_chat()
+            if input_chat is None:
+                logger.debug("Cannot get input_chat for reaction in chat %s", chat_id)
+                return
+            _input_peer_cache[chat_id] = input_chat
+            if len(_input_peer_cache) > _INPUT_PEER_CACHE_SIZE:
+                _input_peer_cache.popitem(last=False)
+
+        reaction = _reactions.get(emoticon)
+        if reaction is None:
+            reaction = _reactions[emoticon] = [types.ReactionEmoji(emoticon=emoticon)]
 
         await client(SendReactionRequest(
             peer=input_chat,
             msg_id=event.message.id,
-            reaction=[types.ReactionEmoji(emoticon=emoticon)]
+            reaction=reaction
         ))
     except ReactionInvalidError:
-        logger.debug(f"Reaction not allowed in chat {event.chat_id}")
+        logger.debug("Reaction not allowed in chat %s", chat_id)
     except Exception as e:
-        logger.warning(f"Failed to send reaction: {e}")
+        logger.warning("Failed to send reaction: %s", e)
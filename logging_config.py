@@ -1,9 +1,120 @@
 """
 Structured logging configuration for telegram-assistant.
 """
+import atexit
+import functools
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    Stream handler that joins records into one write.
+
+    Formatted records are buffered and written when the buffer reaches
+    `capacity` records, when `flush_interval` seconds have passed since the
+    last write, or when flush() is called.
+    """
+
+    def __init__(self, stream=None, capacity: int = 64, flush_interval: float = 0.1):
+        super().__init__(stream)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._buffer.append(self.format(record) + self.terminator)
+            if (len(self._buffer) >= self.capacity
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._buffer:
+                self.stream.write(''.join(self._buffer))
+                self._buffer.clear()
+            self._last_flush = time.monotonic()
+            super().flush()
+        finally:
+            self.release()
+
+
+class DedupFilter(logging.Filter):
+    """
+    Suppress repeats of the same warning or error within a short window.
+
+    Records at `level` and above are identified by (logger name, level,
+    rendered message). A line that repeats within `window` seconds is
+    dropped; the next copy that gets through notes how many were suppressed.
+    Lower levels always pass. At most MAX_KEYS recent lines are remembered,
+    dropping the oldest first.
+
+    Meant for the listener-side handler (see setup_logging), so the work
+    happens off the event loop thread.
+    """
+
+    MAX_KEYS = 1024
+
+    def __init__(self, window: float = 5.0, level: int = logging.WARNING):
+        super().__init__()
+        self.window = window
+        self.level = level
+        # key -> [last emit time, suppressed count], oldest emit first
+        self._seen: "OrderedDict[Tuple[str, int, str], list]" = OrderedDict()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level:
+            return True
+
+        message = record.getMessage()
+        key = (record.name, record.levelno, message)
+        now = time.monotonic()
+        entry = self._seen.get(key)
+
+        if entry is not None and now - entry[0] < self.window:
+            entry[1] += 1
+            return False
+
+        if entry is not None and entry[1]:
+            record.msg = f"{message} ({entry[1]} identical message(s) suppressed)"
+            record.args = None
+
+        self._seen[key] = [now, 0]
+        self._seen.move_to_end(key)
+        if len(self._seen) > self.MAX_KEYS:
+            self._seen.popitem(last=False)
+        return True
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever the queue runs dry."""
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return super().dequeue(block)
+
+    def stop(self) -> None:
+        super().stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
+# Background threads that write queued records to stdout (see setup_logging)
+_listeners: List[logging.handlers.QueueListener] = []
 
 
 def setup_logging(level: int = logging.INFO, name: str = 'telegram-assistant') -> logging.Logger:
@@ -25,7 +136,7 @@ def setup_logging(level: int = logging.INFO, name: str = 'telegram-assistant') -
         return logger
 
     # Console handler with formatting
-    handler = logging.StreamHandler(sys.stdout)
+    handler = BufferedStreamHandler(sys.stdout)
     handler.setLevel(level)
 
     formatter = logging.Formatter(
@@ -33,12 +144,31 @@ def setup_logging(level: int = logging.INFO, name: str = 'telegram-assistant') -
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     handler.setFormatter(formatter)
+    handler.addFilter(DedupFilter())
+
+    # The calling (event loop) thread only enqueues records; dedup and the
+    # blocking stdout writes (in batches) happen on the listener thread
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    logger.addHandler(queue_handler)
 
-    logger.addHandler(handler)
+    listener = _FlushingQueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
 
     return logger
 
 
+def stop_logging() -> None:
+    """Flush queued log records and stop the background listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(stop_logging)
+
+
 # Create default logger
 logger = setup_logging()
 
@@ -54,5 +184,11 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
         Logger instance
     """
     if name:
-        return logging.getLogger(f'telegram-assistant.{name}')
+        return _child_logger(name)
     return logger
+
+
+@functools.lru_cache(maxsize=128)
+def _child_logger(name: str) -> logging.Logger:
+    """Return the 'telegram-assistant.<name>' logger, memoized per name."""
+    return logging.getLogger(f'telegram-assistant.{name}')
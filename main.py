@@ -8,6 +8,17 @@ Main entry point that runs:
 from __future__ import annotations
 
 import asyncio
+import os
+import signal
+from datetime import timedelta
+
+# Use uvloop when available; the policy must be installed before any Telethon
+# client is created so that client.loop is the uvloop-backed loop
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    uvloop = None
 
 import hypercorn
 from hypercorn.config import Config as HypercornConfig
@@ -16,14 +27,14 @@ from telethon.sync import TelegramClient
 from telethon.errors import AuthKeyUnregisteredError
 
 from config import config
-from logging_config import logger
-from models import Reply, Settings, Schedule, VipList
+from logging_config import logger, stop_logging
+from models import Reply, Settings, Schedule, VipList, enable_wal_mode, get_now
 from routes import register_routes
-from handlers import register_handlers
-from bot_handlers import register_bot_handlers, set_owner_id, set_owner_username, set_bot_username, set_personal_id, set_personal_username
-from services.caldav_service import caldav_service
-from telethon.tl.functions.account import UpdateEmojiStatusRequest
-from telethon.tl.types import EmojiStatus
+from handlers import register_handlers, start_background_workers, get_me_cached, invalidate_me_cache, get_emoji_status, set_emoji_status, close_notification_service
+from bot_handlers import register_bot_handlers, set_owner_id, set_owner_username, set_bot_username, set_personal_id, set_personal_username, wait_until_authorized, is_authorized, clear_authorized, get_main_menu_keyboard, get_owner_id
+from services.caldav_service import caldav_service, CalendarEventType
+from services.productivity_service import get_productivity_service
+from services.yandex_gpt_service import get_yandex_gpt_service, close_yandex_gpt_service
 
 
 # =============================================================================
@@ -36,8 +47,7 @@ def create_app() -> Quart:
     app.secret_key = config.secret_key
 
     # Apply prefix middleware if configured
-    if config.script_name:
-        app.asgi_app = PrefixMiddleware(app.asgi_app, config.script_name)
+    app.asgi_app = wrap_prefix(app.asgi_app, config.script_name)
 
     return app
 
@@ -57,16 +67,29 @@ def create_bot() -> TelegramClient | None:
 class PrefixMiddleware:
     """ASGI middleware to handle SCRIPT_NAME for reverse proxy."""
 
+    __slots__ = ('app', 'prefix')
+
     def __init__(self, asgi_app, prefix: str = ''):
         self.app = asgi_app
         self.prefix = prefix.rstrip('/')
 
     async def __call__(self, scope, receive, send):
-        if scope['type'] == 'http' and self.prefix:
+        if scope['type'] == 'http':
             scope['root_path'] = self.prefix
         return await self.app(scope, receive, send)
 
 
+def wrap_prefix(asgi_app, prefix: str):
+    """Wrap asgi_app in PrefixMiddleware, or return it as-is for an empty prefix.
+
+    Without a prefix requests never pass through an extra layer that has
+    nothing to do.
+    """
+    if not (prefix or '').rstrip('/'):
+        return asgi_app
+    return PrefixMiddleware(asgi_app, prefix)
+
+
 # =============================================================================
 # Application Instances
 # =============================================================================
@@ -91,16 +114,22 @@ if bot:
 @app.before_serving
 async def startup():
     """Initialize database tables on startup."""
-    Reply().createTable()
-    Settings().createTable()
-    Schedule().createTable()
-    VipList().createTable()
+    await asyncio.to_thread(_create_tables)
     logger.info("Database tables initialized")
 
     # Migrate VIP usernames from environment to database
     await migrate_vip_from_env()
 
 
+def _create_tables():
+    """Create all model tables (blocking SQLite calls, run in a worker thread)."""
+    enable_wal_mode()
+    Reply().createTable()
+    Settings().createTable()
+    Schedule().createTable()
+    VipList().createTable()
+
+
 async def migrate_vip_from_env():
     """Migrate VIP_USERNAMES from ENV to database on first run."""
     # Skip if already have VIP entries in database
@@ -111,314 +140,416 @@ async def migrate_vip_from_env():
     if config.vip_usernames:
         count = VipList.migrate_from_env(config.vip_usernames)
         if count > 0:
-            logger.info(f"Migrated {count} VIP users from environment to database")
+            logger.info("Migrated %s VIP users from environment to database", count)
 
 
 @app.after_serving
 async def cleanup():
-    """Disconnect Telethon clients on shutdown."""
+    """Disconnect Telethon clients and close HTTP sessions on shutdown."""
     await client.disconnect()
     if bot:
         await bot.disconnect()
     logger.info("Telethon clients disconnected")
+    await close_yandex_gpt_service()
+    await close_notification_service()
 
 
 # =============================================================================
-# Schedule Checker
+# Background Dispatcher
 # =============================================================================
 
-async def schedule_checker():
-    """Background task that checks schedule and updates emoji status."""
-    logger.info("Starting schedule checker...")
+# Retry delays for a failing background check, in seconds
+CHECK_RETRY_MIN_SECONDS = 1.0
+CHECK_RETRY_MAX_SECONDS = 60.0
 
-    # Wait for client to be authorized
-    while not await client.is_user_authorized():
-        await asyncio.sleep(5)
 
-    logger.info("Schedule checker active")
+async def background_dispatcher():
+    """Background task that runs the schedule, productivity and calendar checks.
 
-    check_count = 0
-
-    while True:
+    Each check returns the number of seconds until it wants to run again; the
+    dispatcher sleeps until the earliest of those deadlines and starts only the
+    checks that are due. Every check runs as its own task, so a slow one (e.g.
+    the productivity summary or a CalDAV query) never delays the others, and a
+    check still running is not started again. Schedule edits and
+    productivity/calendar settings wake it early to re-run the corresponding
+    check.
+    """
+    logger.info("Starting background dispatcher...")
+
+    # Wait for client to be authorized (set via set_owner_id)
+    await wait_until_authorized()
+
+    logger.info("Background dispatcher active")
+
+    loop = asyncio.get_running_loop()
+    checks = {
+        'schedule': check_schedule,
+        'productivity': check_productivity_summary,
+        'calendar': check_calendar,
+    }
+    next_due = dict.fromkeys(checks, loop.time())
+    backoff = dict.fromkeys(checks, CHECK_RETRY_MIN_SECONDS)
+    wake_events = {
+        'schedule': Schedule.changed_event(),
+        'productivity': Settings.config_event('productivity'),
+        'calendar': Settings.config_event('calendar'),
+    }
+    # Checks in progress, and those woken meanwhile (re-run once they finish)
+    running = {}
+    rerun = set()
+
+    async def run_check(name):
+        # Failed checks are retried after 1s, 2s, 4s, ... up to a minute
         try:
-            await asyncio.sleep(60)  # Check every minute
-            check_count += 1
-
-            if not Schedule.is_scheduling_enabled():
-                continue
-
-            # Clean up expired overrides every hour
-            if check_count % 60 == 0:
-                deleted = Schedule.delete_expired()
-                if deleted > 0:
-                    logger.info(f"Deleted {deleted} expired override(s)")
-
-            scheduled_emoji_id = Schedule.get_current_emoji_id()
-            if scheduled_emoji_id is None:
-                continue
-
-            # Get current actual status
-            me = await client.get_me()
-            current_emoji_id = me.emoji_status.document_id if me.emoji_status else None
-
-            # Only update if different from what schedule says it should be
-            if current_emoji_id != scheduled_emoji_id:
-                logger.info(f"Changing emoji status: {current_emoji_id} -> {scheduled_emoji_id}")
-                try:
-                    await client(UpdateEmojiStatusRequest(
-                        emoji_status=EmojiStatus(document_id=scheduled_emoji_id)
-                    ))
-                    logger.info(f"Emoji status updated to {scheduled_emoji_id}")
-                except Exception as e:
-                    logger.error(f"Failed to update emoji status: {e}")
-
-        except asyncio.CancelledError:
-            logger.info("Schedule checker stopped")
-            break
+            delay = await checks[name]()
         except Exception as e:
-            logger.error(f"Schedule checker error: {e}")
-            await asyncio.sleep(60)  # Wait before retrying on error
+            delay = backoff[name]
+            backoff[name] = min(delay * 2, CHECK_RETRY_MAX_SECONDS)
+            logger.error("%s check failed, retrying in %.0fs: %s", name.capitalize(), delay, e)
+        else:
+            backoff[name] = CHECK_RETRY_MIN_SECONDS
+        return delay
+
+    try:
+        while True:
+            # Pause while the session is revoked until the bot re-authorizes it
+            await wait_until_authorized()
+
+            now = loop.time()
+            for name, deadline in next_due.items():
+                if deadline <= now and name not in running:
+                    running[name] = asyncio.create_task(run_check(name))
+                    next_due[name] = float('inf')
+
+            waiters = [asyncio.ensure_future(event.wait()) for event in wake_events.values()]
+            timeout = min(next_due.values()) - now
+            try:
+                await asyncio.wait(
+                    waiters + list(running.values()),
+                    timeout=max(0.0, timeout) if timeout != float('inf') else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                for waiter in waiters:
+                    waiter.cancel()
+
+            now = loop.time()
+            for name, task in list(running.items()):
+                if task.done():
+                    del running[name]
+                    next_due[name] = now if name in rerun else now + task.result()
+                    rerun.discard(name)
+            for name, event in wake_events.items():
+                if event.is_set():
+                    event.clear()
+                    if name in running:
+                        rerun.add(name)
+                    else:
+                        next_due[name] = now
+    except asyncio.CancelledError:
+        logger.info("Background dispatcher stopped")
+        for task in running.values():
+            task.cancel()
+        await asyncio.gather(*running.values(), return_exceptions=True)
+        # Clean up if we have an active calendar state
+        _end_calendar_state()
+        raise
+
+
+# =============================================================================
+# Schedule Checker
+# =============================================================================
+
+# Upper bound on how long to wait between schedule checks
+SCHEDULE_IDLE_SECONDS = 3600
+
+
+async def check_schedule() -> float:
+    """Apply the scheduled emoji status if it differs from the current one.
+
+    Returns:
+        Seconds until the next schedule boundary (capped at SCHEDULE_IDLE_SECONDS)
+    """
+    if not Schedule.is_scheduling_enabled():
+        return SCHEDULE_IDLE_SECONDS
+
+    scheduled_emoji_id = Schedule.get_current_emoji_id()
+
+    # Clean up expired overrides. This checks the rules just loaded (still in
+    # the Schedule cache), so the database is only written when one expired.
+    deleted = Schedule.delete_expired()
+    if deleted > 0:
+        logger.info("Deleted %s expired override(s)", deleted)
+
+    if scheduled_emoji_id is not None:
+        # Known from our own updates; re-read from Telegram after changes made
+        # elsewhere, on startup and hourly as a safety net
+        current_emoji_id = await get_emoji_status(client)
+
+        # Only update if different from what schedule says it should be
+        # (a failed update propagates so the dispatcher retries with backoff)
+        if current_emoji_id != scheduled_emoji_id:
+            logger.info("Changing emoji status: %s -> %s", current_emoji_id, scheduled_emoji_id)
+            await set_emoji_status(client, scheduled_emoji_id)
+            logger.info("Emoji status updated to %s", scheduled_emoji_id)
+
+    # Sleep until the next rule boundary instead of polling
+    now = get_now()
+    next_change, _ = Schedule.next_change_after(now)
+    if next_change is None:
+        return SCHEDULE_IDLE_SECONDS
+    return min(SCHEDULE_IDLE_SECONDS, max(1.0, (next_change - now).total_seconds()))
 
 
 # =============================================================================
 # Productivity Summary Scheduler
 # =============================================================================
 
-async def productivity_summary_scheduler():
-    """Background task that sends daily productivity summary at configured time."""
-    from zoneinfo import ZoneInfo
-    from services.productivity_service import get_productivity_service
-    from services.yandex_gpt_service import get_yandex_gpt_service
+# How long to wait while the summary is disabled or has no valid time
+# (settings changes wake the dispatcher early)
+PRODUCTIVITY_IDLE_SECONDS = 3600
 
-    logger.info("Starting productivity summary scheduler...")
+# Next time the summary is due, and the HH:MM setting it was computed from
+_productivity_next_fire = None
+_productivity_fire_time = None
 
-    # Wait for client to be authorized
-    while not await client.is_user_authorized():
-        await asyncio.sleep(5)
 
-    logger.info("Productivity summary scheduler active")
+async def check_productivity_summary() -> float:
+    """Send the daily productivity summary if its configured time has come.
 
-    last_sent_date = None
-    tz = ZoneInfo(config.timezone)
+    Returns:
+        Seconds until the next check
+    """
+    global _productivity_next_fire, _productivity_fire_time
 
-    while True:
+    # Check if feature is enabled
+    if not Settings.is_productivity_summary_enabled():
+        return PRODUCTIVITY_IDLE_SECONDS
+
+    # Get configured time
+    summary_time = Settings.get_productivity_summary_time()
+    if not summary_time:
+        return PRODUCTIVITY_IDLE_SECONDS
+
+    # Get current time in configured timezone
+    now = get_now()
+
+    # Work out the next send time once per configured time, not every tick
+    # (recomputed if the setting changed or the slot was missed while disabled)
+    if (summary_time != _productivity_fire_time or _productivity_next_fire is None
+            or now >= _productivity_next_fire + timedelta(minutes=1)):
         try:
-            await asyncio.sleep(60)  # Check every minute
+            hour, minute = map(int, summary_time.split(':'))
+            next_fire = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        except (ValueError, AttributeError):
+            return PRODUCTIVITY_IDLE_SECONDS
+        # Still fire if we are within the configured minute
+        if next_fire + timedelta(minutes=1) <= now:
+            next_fire += timedelta(days=1)
+        _productivity_next_fire = next_fire
+        _productivity_fire_time = summary_time
 
-            # Check if feature is enabled
-            if not Settings.is_productivity_summary_enabled():
-                continue
+    if now < _productivity_next_fire:
+        return (_productivity_next_fire - now).total_seconds()
 
-            # Get configured time
-            summary_time = Settings.get_productivity_summary_time()
-            if not summary_time:
-                continue
+    # Advancing the deadline by a day is what prevents duplicate sends
+    _productivity_next_fire += timedelta(days=1)
 
-            # Parse time
-            try:
-                hour, minute = map(int, summary_time.split(':'))
-            except (ValueError, AttributeError):
-                continue
-
-            # Get current time in configured timezone
-            from datetime import datetime
-            now = datetime.now(tz)
-
-            # Check if it's time to send (within the same minute)
-            if now.hour == hour and now.minute == minute:
-                # Prevent duplicate sends on the same day
-                today = now.date()
-                if last_sent_date == today:
-                    continue
-
-                last_sent_date = today
-                logger.info("Generating daily productivity summary...")
-
-                try:
-                    # Generate summary
-                    service = get_productivity_service()
-                    gpt_service = get_yandex_gpt_service()
-
-                    # Get extra chat IDs for muted chats user wants to include
-                    # Combine permanent extra chats + temporary chats (from mentions/replies)
-                    extra_chat_ids = Settings.get_productivity_extra_chats()
-                    temp_chat_ids = Settings.get_productivity_temp_chats()
-                    all_extra_chats = list(set(extra_chat_ids + temp_chat_ids))
-
-                    daily = await service.collect_daily_messages(
-                        client, extra_chat_ids=all_extra_chats
-                    )
-                    summary_text = await service.generate_daily_summary(daily, gpt_service)
-
-                    # Clear temporary chats after summary is generated
-                    Settings.clear_productivity_temp_chats()
-                    if temp_chat_ids:
-                        logger.info(f"Cleared {len(temp_chat_ids)} temporary productivity chats")
-
-                    # Send via bot if available, otherwise via user client
-                    if bot and await bot.is_user_authorized():
-                        from bot_handlers import get_owner_id
-                        owner_id = get_owner_id()
-                        if owner_id:
-                            await bot.send_message(owner_id, summary_text)
-                            logger.info("Daily productivity summary sent via bot")
-                    else:
-                        await client.send_message(config.personal_tg_login, summary_text)
-                        logger.info("Daily productivity summary sent via user client")
+    logger.info("Generating daily productivity summary...")
 
-                except Exception as e:
-                    logger.error(f"Failed to generate/send productivity summary: {e}")
+    try:
+        # Generate summary
+        service = get_productivity_service()
+        gpt_service = get_yandex_gpt_service()
 
-        except asyncio.CancelledError:
-            logger.info("Productivity summary scheduler stopped")
-            break
-        except Exception as e:
-            logger.error(f"Productivity summary scheduler error: {e}")
-            await asyncio.sleep(60)
+        # Get extra chat IDs for muted chats user wants to include
+        # Combine permanent extra chats + temporary chats (from mentions/replies)
+        all_extra_chats = Settings.get_productivity_all_chats()
+
+        daily = await service.collect_daily_messages(
+            client, extra_chat_ids=all_extra_chats
+        )
+        summary_text = await service.generate_daily_summary(daily, gpt_service)
+
+        # Clear temporary chats after summary is generated
+        temp_chat_ids = Settings.get_productivity_temp_chats()
+        Settings.clear_productivity_temp_chats()
+        if temp_chat_ids:
+            logger.info("Cleared %s temporary productivity chats", len(temp_chat_ids))
+
+        # Send via bot if available, otherwise via user client
+        if bot and _get_bot_ready_event().is_set():
+            owner_id = get_owner_id()
+            if owner_id:
+                await bot.send_message(owner_id, summary_text)
+                logger.info("Daily productivity summary sent via bot")
+        else:
+            await client.send_message(config.personal_tg_login, summary_text)
+            logger.info("Daily productivity summary sent via user client")
+
+    except Exception as e:
+        logger.error("Failed to generate/send productivity summary: %s", e)
+
+    return (_productivity_next_fire - get_now()).total_seconds()
 
 
 # =============================================================================
 # Calendar Checker
 # =============================================================================
 
-async def calendar_checker():
-    """Background task that monitors CalDAV calendar for meetings and absences.
+# Track current calendar state: None, 'meeting', or 'absence'
+_calendar_state = None
+
+
+def _end_calendar_state():
+    """Remove the meeting/absence rule created for the current calendar state."""
+    if _calendar_state == 'meeting':
+        Schedule.end_meeting()
+    elif _calendar_state == 'absence':
+        Schedule.end_absence()
+
+
+async def _restore_scheduled_emoji():
+    """Apply the emoji the schedule wants after a calendar status ends."""
+    scheduled_emoji_id = Schedule.get_current_emoji_id()
+    if scheduled_emoji_id:
+        try:
+            await set_emoji_status(client, scheduled_emoji_id)
+            logger.info("Restored scheduled emoji: %s", scheduled_emoji_id)
+        except Exception as e:
+            logger.error("Failed to restore emoji status: %s", e)
+
+
+async def check_calendar() -> float:
+    """Monitor CalDAV calendar for meetings and absences.
 
     Configuration is stored in Settings and can be changed at runtime via bot.
     Supports two event types:
     - Meeting: Uses meeting_emoji_id, priority 50
     - Absence: Uses absence_emoji_id, priority 75 (higher than meeting)
-    """
-    from services.caldav_service import CalendarEventType
-
-    logger.info("Starting calendar checker...")
 
-    # Wait for client to be authorized
-    while not await client.is_user_authorized():
-        await asyncio.sleep(5)
+    Returns:
+        Seconds until the next check
+    """
+    global _calendar_state
+
+    # Check if CalDAV is configured and calendar sync is enabled
+    if not Settings.is_caldav_configured() or not Settings.is_calendar_sync_enabled():
+        if _calendar_state:
+            # End any active calendar event if sync got disabled
+            logger.info("Calendar sync disabled, ending calendar-triggered status")
+            _end_calendar_state()
+            await _restore_scheduled_emoji()
+            _calendar_state = None
+        # Enabling sync via bot wakes the dispatcher early
+        return config.caldav_check_interval_max
+
+    # Get emoji for both types
+    meeting_emoji = Settings.get('meeting_emoji_id')
+    absence_emoji = Settings.get_absence_emoji_id()
+
+    # Check for active calendar event with priority (absence > meeting).
+    # Each CalDAV request is bounded by config.caldav_timeout in the client
+    # itself; cancelling here would not stop the blocking executor threads.
+    event_type, event = await caldav_service.check_calendar_status_with_priority()
+    logger.debug(
+        "Calendar check: type=%s, current_state=%s",
+        event_type.value if event_type else None, _calendar_state
+    )
+
+    # Determine target state based on event type and available emoji
+    target_state = None
+    target_emoji = None
+
+    if event_type == CalendarEventType.ABSENCE and absence_emoji:
+        target_state = 'absence'
+        target_emoji = absence_emoji
+    elif event_type == CalendarEventType.MEETING and meeting_emoji:
+        target_state = 'meeting'
+        target_emoji = meeting_emoji
+    elif event_type == CalendarEventType.ABSENCE and not absence_emoji and meeting_emoji:
+        # Fallback: absence event but no absence emoji - use meeting emoji
+        target_state = 'absence'
+        target_emoji = meeting_emoji
+        logger.debug("Using meeting emoji for absence (absence emoji not configured)")
+
+    # Handle state transitions
+    if target_state != _calendar_state:
+        # End previous state if any
+        if _calendar_state == 'meeting':
+            Schedule.end_meeting()
+            logger.info("Ending calendar meeting")
+        elif _calendar_state == 'absence':
+            Schedule.end_absence()
+            logger.info("Ending calendar absence")
+
+        # Start new state if any
+        if target_state == 'absence':
+            logger.info("Calendar absence started: %s", event.summary)
+            Schedule.start_absence(target_emoji)
+            try:
+                await set_emoji_status(client, int(target_emoji))
+                logger.info("Absence status activated for: %s", event.summary)
+            except Exception as e:
+                logger.error("Failed to update emoji status: %s", e)
+
+        elif target_state == 'meeting':
+            logger.info("Calendar meeting started: %s", event.summary)
+            Schedule.start_meeting(target_emoji)
+            try:
+                await set_emoji_status(client, int(target_emoji))
+                logger.info("Meeting status activated for: %s", event.summary)
+            except Exception as e:
+                logger.error("Failed to update emoji status: %s", e)
 
-    logger.info("Calendar checker active")
+        elif target_state is None and _calendar_state is not None:
+            # No active event - restore scheduled emoji
+            logger.info("Calendar event ended, restoring schedule")
+            await _restore_scheduled_emoji()
 
-    # Track current calendar state: None, 'meeting', or 'absence'
-    current_calendar_state = None
+        _calendar_state = target_state
 
-    while True:
-        try:
-            await asyncio.sleep(config.caldav_check_interval)
-
-            # Check if CalDAV is configured and calendar sync is enabled
-            if not Settings.is_caldav_configured() or not Settings.is_calendar_sync_enabled():
-                if current_calendar_state:
-                    # End any active calendar event if sync got disabled
-                    logger.info("Calendar sync disabled, ending calendar-triggered status")
-                    if current_calendar_state == 'meeting':
-                        Schedule.end_meeting()
-                    elif current_calendar_state == 'absence':
-                        Schedule.end_absence()
-                    # Restore scheduled emoji
-                    scheduled_emoji_id = Schedule.get_current_emoji_id()
-                    if scheduled_emoji_id:
-                        try:
-                            await client(UpdateEmojiStatusRequest(
-                                emoji_status=EmojiStatus(document_id=scheduled_emoji_id)
-                            ))
-                        except Exception as e:
-                            logger.error(f"Failed to restore emoji status: {e}")
-                    current_calendar_state = None
-                continue
-
-            # Get emoji for both types
-            meeting_emoji = Settings.get('meeting_emoji_id')
-            absence_emoji = Settings.get_absence_emoji_id()
-
-            # Check for active calendar event with priority (absence > meeting)
-            event_type, event = await caldav_service.check_calendar_status_with_priority()
-            logger.debug(
-                f"Calendar check: type={event_type.value if event_type else None}, "
-                f"current_state={current_calendar_state}"
-            )
-
-            # Determine target state based on event type and available emoji
-            target_state = None
-            target_emoji = None
-
-            if event_type == CalendarEventType.ABSENCE and absence_emoji:
-                target_state = 'absence'
-                target_emoji = absence_emoji
-            elif event_type == CalendarEventType.MEETING and meeting_emoji:
-                target_state = 'meeting'
-                target_emoji = meeting_emoji
-            elif event_type == CalendarEventType.ABSENCE and not absence_emoji and meeting_emoji:
-                # Fallback: absence event but no absence emoji - use meeting emoji
-                target_state = 'absence'
-                target_emoji = meeting_emoji
-                logger.debug("Using meeting emoji for absence (absence emoji not configured)")
-
-            # Handle state transitions
-            if target_state != current_calendar_state:
-                # End previous state if any
-                if current_calendar_state == 'meeting':
-                    Schedule.end_meeting()
-                    logger.info("Ending calendar meeting")
-                elif current_calendar_state == 'absence':
-                    Schedule.end_absence()
-                    logger.info("Ending calendar absence")
-
-                # Start new state if any
-                if target_state == 'absence':
-                    logger.info(f"Calendar absence started: {event.summary}")
-                    Schedule.start_absence(target_emoji)
-                    try:
-                        await client(UpdateEmojiStatusRequest(
-                            emoji_status=EmojiStatus(document_id=int(target_emoji))
-                        ))
-                        logger.info(f"Absence status activated for: {event.summary}")
-                    except Exception as e:
-                        logger.error(f"Failed to update emoji status: {e}")
-
-                elif target_state == 'meeting':
-                    logger.info(f"Calendar meeting started: {event.summary}")
-                    Schedule.start_meeting(target_emoji)
-                    try:
-                        await client(UpdateEmojiStatusRequest(
-                            emoji_status=EmojiStatus(document_id=int(target_emoji))
-                        ))
-                        logger.info(f"Meeting status activated for: {event.summary}")
-                    except Exception as e:
-                        logger.error(f"Failed to update emoji status: {e}")
-
-                elif target_state is None and current_calendar_state is not None:
-                    # No active event - restore scheduled emoji
-                    logger.info("Calendar event ended, restoring schedule")
-                    scheduled_emoji_id = Schedule.get_current_emoji_id()
-                    if scheduled_emoji_id:
-                        try:
-                            await client(UpdateEmojiStatusRequest(
-                                emoji_status=EmojiStatus(document_id=scheduled_emoji_id)
-                            ))
-                            logger.info(f"Restored scheduled emoji: {scheduled_emoji_id}")
-                        except Exception as e:
-                            logger.error(f"Failed to restore emoji status: {e}")
-
-                current_calendar_state = target_state
-
-        except asyncio.CancelledError:
-            logger.info("Calendar checker stopped")
-            # Clean up if we have an active calendar state
-            if current_calendar_state == 'meeting':
-                Schedule.end_meeting()
-            elif current_calendar_state == 'absence':
-                Schedule.end_absence()
-            break
-        except Exception as e:
-            logger.error(f"Calendar checker error: {e}")
-            await asyncio.sleep(60)  # Wait before retrying on error
+    # Sleep until the next known event start/end; without one in the future
+    # (fetch failed or nothing cached) fall back to the regular interval
+    boundary = caldav_service.next_boundary
+    interval = (boundary - get_now()).total_seconds() if boundary is not None else 0
+    if interval <= 0:
+        return config.caldav_check_interval
+    return max(config.caldav_check_interval_min, min(config.caldav_check_interval_max, interval))
 
 
 # =============================================================================
 # Main Entry Point
 # =============================================================================
 
+# Delay before reconnecting after a session or connection error; doubles on repeats
+RECONNECT_MIN_SECONDS = 2
+RECONNECT_MAX_SECONDS = 60
+
+# How often to re-check the session while waiting for the bot-driven login
+AUTH_RECHECK_SECONDS = 60
+
+# Background tasks started by run_telethon(); referenced here so they can't be
+# garbage-collected mid-run, and cancelled by main() on shutdown
+_background_tasks: set = set()
+
+
+def _start_background_task(coro) -> asyncio.Task:
+    """Start a task that main() cancels on shutdown."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _cancel_background_tasks():
+    """Cancel background tasks and wait for them to finish."""
+    tasks = list(_background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
 async def run_telethon():
     """Run the Telethon client event loop."""
     logger.info("Connecting Telethon client...")
@@ -428,11 +559,11 @@ async def run_telethon():
     # Check if already authorized
     if await client.is_user_authorized():
         # Set owner ID and username for bot access control
-        me = await client.get_me()
+        me = await get_me_cached(client)
         set_owner_id(me.id)
         if me.username:
             set_owner_username(me.username)
-        logger.info(f"Telethon client authorized as {me.id} (@{me.username})")
+        logger.info("Telethon client authorized as %s (@%s)", me.id, me.username)
 
         # Set personal account ID for bot access (PERSONAL_TG_LOGIN)
         await _init_personal_account()
@@ -442,20 +573,20 @@ async def run_telethon():
     else:
         logger.info("Telethon client not authorized. Waiting for authentication via bot...")
 
-    # Start schedule checker as a background task
-    asyncio.create_task(schedule_checker())
+    # Start schedule, productivity and calendar checks as one background task
+    _start_background_task(background_dispatcher())
 
-    # Start productivity summary scheduler
-    asyncio.create_task(productivity_summary_scheduler())
-
-    # Start calendar checker as a background task
-    asyncio.create_task(calendar_checker())
+    # Pending-mention checker and ASAP workers
+    start_background_workers(_start_background_task)
 
     # Start background task to detect when auth is complete
-    asyncio.create_task(_wait_for_auth())
+    _start_background_task(_wait_for_auth())
 
-    # Run client with reconnection on auth errors (e.g., after logout)
+    # Run client with reconnection on auth and connection errors (e.g., after logout)
+    loop = asyncio.get_running_loop()
+    reconnect_delay = RECONNECT_MIN_SECONDS
     while True:
+        connected_at = loop.time()
         try:
             # Only run event loop if authorized, otherwise just wait
             if await client.is_user_authorized():
@@ -463,45 +594,87 @@ async def run_telethon():
                 break  # Normal exit
             else:
                 # Not authorized - wait for bot-based auth
-                await asyncio.sleep(5)
+                reconnect_delay = RECONNECT_MIN_SECONDS
+                if is_authorized():
+                    # Marked authorized but the session says otherwise;
+                    # re-check periodically rather than spinning
+                    await asyncio.sleep(5)
+                else:
+                    # Wake up now and then anyway so a dropped connection
+                    # goes through the reconnect path below
+                    try:
+                        await asyncio.wait_for(wait_until_authorized(), timeout=AUTH_RECHECK_SECONDS)
+                    except asyncio.TimeoutError:
+                        if not client.is_connected():
+                            raise ConnectionError("disconnected while waiting for login")
         except AuthKeyUnregisteredError:
             # Session invalidated (e.g., after logout) - delete session and reconnect
             logger.info("Session invalidated. Cleaning up and waiting for new authentication...")
+            clear_authorized()
+            invalidate_me_cache()
 
             # Delete invalid session file
-            import os
-            session_file = config.session_path + '.session'
-            if os.path.exists(session_file):
-                try:
-                    os.remove(session_file)
-                    logger.info(f"Invalid session file deleted: {session_file}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete session file: {e}")
-
-            # Reconnect with fresh session
+            session_file = config.session_file
             try:
-                await client.disconnect()
-            except Exception:
+                await asyncio.to_thread(os.unlink, session_file)
+                logger.info("Invalid session file deleted: %s", session_file)
+            except FileNotFoundError:
                 pass
+            except OSError as e:
+                logger.warning("Failed to delete session file: %s", e)
+        except ConnectionError as e:
+            logger.warning("Telegram connection lost: %s", e)
+        else:
+            continue
+
+        # A connection that stayed up for a while counts as recovered
+        if loop.time() - connected_at >= RECONNECT_MAX_SECONDS:
+            reconnect_delay = RECONNECT_MIN_SECONDS
+
+        # Reconnect (with a fresh session after AuthKeyUnregisteredError),
+        # backing off while failures keep repeating
+        logger.info("Reconnecting in %ss...", reconnect_delay)
+        await asyncio.sleep(reconnect_delay)
+        reconnect_delay = min(reconnect_delay * 2, RECONNECT_MAX_SECONDS)
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
+        try:
             await client.connect()
-            await asyncio.sleep(2)
+        except OSError as e:
+            logger.warning("Reconnect failed: %s", e)
 
 
 async def _wait_for_auth():
     """Background task that waits for authorization and sends welcome message."""
     # Only run if not already authorized
-    if await client.is_user_authorized():
+    if is_authorized():
         return
 
-    while True:
-        await asyncio.sleep(2)
-        if await client.is_user_authorized():
-            me = await client.get_me()
-            logger.info(f"Telethon client now authorized as {me.id} (@{me.username})")
-            # Initialize personal account for bot access
-            await _init_personal_account()
-            await _send_welcome_message()
-            break
+    # The bot sign-in flow sets the owner once authorization succeeds
+    await wait_until_authorized()
+
+    me = await get_me_cached(client)
+    logger.info("Telethon client now authorized as %s (@%s)", me.id, me.username)
+    # Initialize personal account for bot access
+    await _init_personal_account()
+    await _send_welcome_message()
+
+
+async def _resolve_personal_account(lookup) -> int:
+    """Resolve a personal account login to its user ID.
+
+    The ID is stored in Settings, so only the first startup (or a changed
+    login) costs a get_entity() round trip. Only the ID is kept: it never
+    changes, while a stored username would go stale.
+    """
+    user_id = Settings.get_resolved_personal_account(str(lookup))
+    if user_id is not None:
+        return user_id
+    entity = await client.get_entity(lookup)
+    Settings.set_resolved_personal_account(str(lookup), entity.id)
+    return entity.id
 
 
 async def _init_personal_account():
@@ -510,18 +683,15 @@ async def _init_personal_account():
     Priority:
     1. Settings.get_personal_chat_id() (configured via bot)
     2. config.personal_tg_login (from env variable)
+
+    Bot access is matched on the ID; the username is only a fallback when
+    the login can't be resolved.
     """
     # First check Settings (configured via bot)
     personal_chat_id = Settings.get_personal_chat_id()
     if personal_chat_id:
         set_personal_id(personal_chat_id)
-        try:
-            entity = await client.get_entity(personal_chat_id)
-            if hasattr(entity, 'username') and entity.username:
-                set_personal_username(entity.username)
-            logger.info(f"Personal account set from Settings: {personal_chat_id} (@{getattr(entity, 'username', 'N/A')})")
-        except Exception as e:
-            logger.info(f"Personal account set from Settings: {personal_chat_id} (username not resolved: {e})")
+        logger.info("Personal account set from Settings: %s", personal_chat_id)
         return
 
     # Fallback to env variable
@@ -531,14 +701,12 @@ async def _init_personal_account():
 
     try:
         # Try to resolve the personal account entity
-        entity = await client.get_entity(config.personal_tg_login)
-        set_personal_id(entity.id)
-        if hasattr(entity, 'username') and entity.username:
-            set_personal_username(entity.username)
-        logger.info(f"Personal account resolved from env: {entity.id} (@{getattr(entity, 'username', 'N/A')})")
+        user_id = await _resolve_personal_account(config.personal_tg_login)
+        set_personal_id(user_id)
+        logger.info("Personal account resolved from env: %s", user_id)
     except Exception as e:
         # If we can't resolve, still set the username for fallback matching
-        logger.warning(f"Could not resolve personal account entity: {e}")
+        logger.warning("Could not resolve personal account entity: %s", e)
         # Set username for fallback (if it looks like a username)
         if not config.personal_tg_login.isdigit():
             set_personal_username(config.personal_tg_login)
@@ -550,12 +718,9 @@ async def _send_welcome_message():
         return
 
     # Wait for bot to be ready (max 10 seconds)
-    for _ in range(20):
-        if bot.is_connected() and await bot.is_user_authorized():
-            break
-        await asyncio.sleep(0.5)
-
-    if not (bot.is_connected() and await bot.is_user_authorized()):
+    try:
+        await asyncio.wait_for(_get_bot_ready_event().wait(), timeout=10)
+    except asyncio.TimeoutError:
         return
 
     try:
@@ -564,8 +729,7 @@ async def _send_welcome_message():
         if bot_me.username:
             set_bot_username(bot_me.username)
 
-        me = await client.get_me()
-        from bot_handlers import get_main_menu_keyboard
+        me = await get_me_cached(client)
         await bot.send_message(
             me.id,
             "🤖 **Панель управления автоответчиком**\n\n"
@@ -574,7 +738,19 @@ async def _send_welcome_message():
         )
         logger.info("Welcome message sent to owner")
     except Exception as e:
-        logger.warning(f"Failed to send welcome message: {e}")
+        logger.warning("Failed to send welcome message: %s", e)
+
+
+# Set while run_bot() has the bot client started (created lazily on the running loop)
+_bot_ready_event = None
+
+
+def _get_bot_ready_event() -> asyncio.Event:
+    """Get the event that is set once the bot client is started."""
+    global _bot_ready_event
+    if _bot_ready_event is None:
+        _bot_ready_event = asyncio.Event()
+    return _bot_ready_event
 
 
 async def run_bot():
@@ -584,9 +760,34 @@ async def run_bot():
 
     logger.info("Starting bot client...")
     await bot.start(bot_token=config.bot_token)
+    bot_ready = _get_bot_ready_event()
+    bot_ready.set()
     logger.info("Bot client started")
 
-    await bot.run_until_disconnected()
+    try:
+        await bot.run_until_disconnected()
+    finally:
+        # Don't let welcome messages wait on a bot that is gone
+        bot_ready.clear()
+
+
+def _install_signal_handlers(callback) -> None:
+    """Call callback on SIGINT/SIGTERM instead of killing the process outright."""
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, callback)
+        except NotImplementedError:
+            # Not supported by this event loop (e.g. Windows); keep the default
+            pass
+
+
+async def _cancel_on_shutdown(shutdown_event: asyncio.Event, tasks) -> None:
+    """Cancel the client tasks once shutdown has been requested."""
+    await shutdown_event.wait()
+    logger.info("Shutdown requested, stopping clients...")
+    for task in tasks:
+        task.cancel()
 
 
 async def main():
@@ -594,22 +795,56 @@ async def main():
     try:
         logger.info("Starting application...")
 
+        # Let tasks that finish without suspending skip the scheduler (3.12+)
+        eager_task_factory = getattr(asyncio, 'eager_task_factory', None)
+        if eager_task_factory is not None:
+            asyncio.get_running_loop().set_task_factory(eager_task_factory)
+
+        # Single worker: routes share the Telethon client living in this
+        # process, so more workers would need the client moved out-of-process
         hypercorn_config = HypercornConfig()
         hypercorn_config.bind = [f"{config.host}:{config.port}"]
+        hypercorn_config.backlog = 512
+        hypercorn_config.keep_alive_timeout = 30
+        hypercorn_config.graceful_timeout = 10
+
+        # SIGTERM (docker stop) and SIGINT drain the web server and stop the
+        # clients, so the finally block below can disconnect them cleanly
+        shutdown_event = asyncio.Event()
+        _install_signal_handlers(shutdown_event.set)
 
-        tasks = [
-            hypercorn.asyncio.serve(app, hypercorn_config),
-            run_telethon(),
-        ]
+        server = hypercorn.asyncio.serve(app, hypercorn_config, shutdown_trigger=shutdown_event.wait)
+        clients = [run_telethon()]
 
         # Add bot if configured
         if bot:
-            tasks.append(run_bot())
-
-        await asyncio.gather(*tasks)
+            clients.append(run_bot())
+
+        # TaskGroup (3.11+) cancels the remaining tasks if one of them fails
+        task_group = getattr(asyncio, 'TaskGroup', None)
+        if task_group is not None:
+            async with task_group() as tg:
+                tg.create_task(server)
+                client_tasks = [tg.create_task(coro) for coro in clients]
+                tg.create_task(_cancel_on_shutdown(shutdown_event, client_tasks))
+        else:
+            # gather() leaves siblings running when one fails; cancel them
+            client_tasks = [asyncio.ensure_future(coro) for coro in clients]
+            futures = [
+                asyncio.ensure_future(server),
+                *client_tasks,
+                asyncio.ensure_future(_cancel_on_shutdown(shutdown_event, client_tasks)),
+            ]
+            try:
+                await asyncio.gather(*futures)
+            finally:
+                for future in futures:
+                    future.cancel()
+                await asyncio.gather(*futures, return_exceptions=True)
     except asyncio.CancelledError:
         logger.info("Application shutting down...")
     finally:
+        await _cancel_background_tasks()
         await client.disconnect()
         if bot:
             await bot.disconnect()
@@ -621,16 +856,17 @@ if __name__ == '__main__':
     errors = config.validate()
     if errors:
         for error in errors:
-            logger.error(f"Configuration error: {error}")
+            logger.error("Configuration error: %s", error)
         exit(1)
 
     logger.info("=== TELEGRAM ASSISTANT ===")
-    logger.info(f"API_ID: {config.api_id}")
-    logger.info(f"Port: {config.port}")
-    logger.info(f"Script name: {config.script_name or '(none)'}")
-    logger.info(f"Bot: {'enabled' if config.bot_token else 'disabled'}")
+    logger.info("API_ID: %s", config.api_id)
+    logger.info("Port: %s", config.port)
+    logger.info("Script name: %s", config.script_name or '(none)')
+    logger.info("Bot: %s", 'enabled' if config.bot_token else 'disabled')
+    logger.info("Event loop: %s", 'uvloop' if uvloop else 'asyncio')
     if config.allowed_username:
-        logger.info(f"Allowed username: @{config.allowed_username}")
+        logger.info("Allowed username: @%s", config.allowed_username)
     logger.info("==========================")
 
     try:
@@ -638,4 +874,6 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
+    finally:
+        stop_logging()
@@ -3,9 +3,13 @@ Database models for telegram-assistant.
 
 Uses sqlitemodel ORM for SQLite persistence.
 """
+import asyncio
+import copy
 import json
-from datetime import datetime, date
-from typing import Optional, Any, List
+import sqlite3
+import time
+from datetime import datetime, date, time as dt_time, timedelta
+from typing import Optional, Any, Dict, List
 from zoneinfo import ZoneInfo
 
 from sqlitemodel import Model, Database, SQL
@@ -17,10 +21,26 @@ from config import config
 # Configure database path (can be overridden by config)
 Database.DB_FILE = './storage/database.db'
 
+# Configured timezone, resolved once (get_now() runs on every check and handler)
+_tz = ZoneInfo(config.timezone)
+
 
 def get_now() -> datetime:
     """Get current datetime in the configured timezone."""
-    return datetime.now(ZoneInfo(config.timezone))
+    return datetime.now(_tz)
+
+
+def enable_wal_mode() -> None:
+    """Switch the database to WAL journaling (blocking; call once at startup).
+
+    WAL lets handler reads proceed while a write is in progress. The mode is
+    stored in the database file, so one connection setting it is enough.
+    """
+    conn = sqlite3.connect(Database.DB_FILE)
+    try:
+        conn.execute('PRAGMA journal_mode=WAL')
+    finally:
+        conn.close()
 
 
 def parse_date_str(date_str: str, reference_year: int = None) -> date:
@@ -69,6 +89,44 @@ PRIORITY_OVERRIDE = 100  # Override rules (vacation, sick leave, etc.)
 # Sentinel emoji value for the fallback reply used when no emoji status is set
 DEFAULT_REPLY_EMOJI = "default"
 
+# Settings are read on every handler call and background check but change
+# rarely; cache values per key and drop them whenever a setting is written.
+SETTINGS_CACHE_TTL = 30.0  # seconds
+_settings_cache: dict = {}  # key -> (value, expires_at)
+
+# Reply.get_by_emoji() runs for every incoming private message; keep the
+# lookup result per emoji and drop it whenever a reply is written.
+REPLY_CACHE_TTL = 30.0  # seconds
+_reply_cache: dict = {}  # emoji -> (Reply or None, expires_at)
+
+# Union of productivity extra + temp chats (see Settings.get_productivity_all_chats)
+_productivity_all_chats: Optional[tuple] = None
+
+# Settings keys that background checks react to, grouped by check; writing
+# one of them sets that group's event (see Settings.config_event).
+CONFIG_EVENT_KEYS = {
+    'productivity': frozenset({
+        'productivity_summary_enabled', 'productivity_summary_time',
+    }),
+    'calendar': frozenset({
+        'calendar_sync_enabled', 'caldav_url', 'caldav_username', 'caldav_password',
+        'caldav_calendars', 'caldav_meeting_calendars', 'caldav_absence_calendars',
+        'meeting_emoji_id', 'absence_emoji_id',
+    }),
+}
+# Created lazily so they bind to the running event loop.
+_config_events: Dict[str, asyncio.Event] = {}
+
+# Schedule.get_all() is called several times per bot command and on every
+# schedule tick; keep the rows briefly and drop them on any schedule write.
+SCHEDULE_CACHE_TTL = 1.0  # seconds
+_schedule_cache: Optional[list] = None
+_schedule_cache_time = 0.0
+
+# Set whenever schedule rules change so background tasks can wake up early.
+# Created lazily so it binds to the running event loop.
+_schedule_changed: Optional[asyncio.Event] = None
+
 
 class Reply(Model):
     """
@@ -91,20 +149,31 @@ class Reply(Model):
 
     @property
     def message(self) -> Optional[Message]:
-        """Deserialize and return the stored message."""
-        if not self._message:
+        """Deserialize and return the stored message.
+
+        The decoded message is kept on the instance (cached replies are
+        reused across incoming messages) until _message changes.
+        """
+        raw = self._message
+        decoded = getattr(self, '_decoded', None)
+        if decoded is not None and decoded[0] is raw:
+            return decoded[1]
+        if not raw:
             return None
         try:
-            reader = BinaryReader(self._message)
+            reader = BinaryReader(raw)
             reader.read_int()
-            return Message.from_reader(reader)
+            message = Message.from_reader(reader)
         except Exception:
             return None
+        self._decoded = (raw, message)
+        return message
 
     @message.setter
     def message(self, value: Message) -> None:
         """Serialize and store a message."""
         self._message = value._bytes()
+        self._decoded = (self._message, value)
 
     def columns(self) -> list[dict[str, str]]:
         return [
@@ -112,6 +181,16 @@ class Reply(Model):
             {'name': '_message', 'type': 'TEXT'}
         ]
 
+    def save(self, *args, **kwargs):
+        result = Model.save(self, *args, **kwargs)
+        _reply_cache.clear()
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = Model.delete(self, *args, **kwargs)
+        _reply_cache.clear()
+        return result
+
     @staticmethod
     def create(emoji: Any, msg: Message) -> None:
         """
@@ -122,7 +201,9 @@ class Reply(Model):
             msg: Telethon Message object to store
         """
         emoji_str = str(emoji)
-        reply = Reply.get_by_emoji(emoji_str)
+        # Load the row itself rather than the cached instance handlers share,
+        # so a failed save() can't leave an unsaved message in the cache
+        reply = Reply().selectOne(SQL().WHERE('emoji', '=', emoji_str))
         if reply is None:
             reply = Reply()
         reply.emoji = emoji_str
@@ -134,6 +215,9 @@ class Reply(Model):
         """
         Get reply by emoji ID.
 
+        Results (including misses) are cached for REPLY_CACHE_TTL seconds;
+        saving or deleting any reply drops the cache.
+
         Args:
             emoji: Emoji document ID (int or str)
 
@@ -141,7 +225,14 @@ class Reply(Model):
             Reply object or None if not found
         """
         emoji_str = str(emoji)
-        return Reply().selectOne(SQL().WHERE('emoji', '=', emoji_str))
+        now = time.monotonic()
+        cached = _reply_cache.get(emoji_str)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
+        reply = Reply().selectOne(SQL().WHERE('emoji', '=', emoji_str))
+        _reply_cache[emoji_str] = (reply, now + REPLY_CACHE_TTL)
+        return reply
 
 
 class Settings(Model):
@@ -168,19 +259,61 @@ class Settings(Model):
             {'name': 'value', 'type': 'TEXT'}
         ]
 
+    def save(self, *args, **kwargs):
+        result = Model.save(self, *args, **kwargs)
+        Settings._invalidate(getattr(self, 'key', None))
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = Model.delete(self, *args, **kwargs)
+        Settings._invalidate(getattr(self, 'key', None))
+        return result
+
+    @staticmethod
+    def _invalidate(key: Optional[str] = None) -> None:
+        """Drop a cached setting value (or all of them if key is None)."""
+        global _productivity_all_chats
+        if key is None:
+            _settings_cache.clear()
+        else:
+            _settings_cache.pop(key, None)
+        if key in (None, 'productivity_extra_chats', 'productivity_temp_chats'):
+            _productivity_all_chats = None
+        for group, event in _config_events.items():
+            if key is None or key in CONFIG_EVENT_KEYS[group]:
+                event.set()
+
+    @staticmethod
+    def config_event(group: str) -> asyncio.Event:
+        """Get the event that is set whenever a setting in CONFIG_EVENT_KEYS[group] changes."""
+        event = _config_events.get(group)
+        if event is None:
+            event = _config_events[group] = asyncio.Event()
+        return event
+
     @staticmethod
     def get(key: str) -> Optional[str]:
         """
         Get a setting value by key.
 
+        Values are cached for SETTINGS_CACHE_TTL seconds; Settings.set()
+        updates the cached value and other writes invalidate it.
+
         Args:
             key: Setting key
 
         Returns:
             Setting value or None if not found
         """
+        now = time.monotonic()
+        cached = _settings_cache.get(key)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+
         setting = Settings().selectOne(SQL().WHERE('key', '=', key))
-        return setting.value if setting else None
+        value = setting.value if setting else None
+        _settings_cache[key] = (value, now + SETTINGS_CACHE_TTL)
+        return value
 
     @staticmethod
     def set(key: str, value: str) -> None:
@@ -197,6 +330,8 @@ class Settings(Model):
         setting.key = key
         setting.value = value
         setting.save()
+        # Write-through so the next get() doesn't go back to the database
+        _settings_cache[key] = (value, time.monotonic() + SETTINGS_CACHE_TTL)
 
     @staticmethod
     def get_settings_chat_id() -> Optional[int]:
@@ -390,6 +525,22 @@ class Settings(Model):
         """Clear all temporary chats after summary generation."""
         Settings.set('productivity_temp_chats', '')
 
+    @staticmethod
+    def get_productivity_all_chats() -> tuple:
+        """Get extra and temporary chat IDs combined, without duplicates.
+
+        The result is memoized until either list is changed.
+
+        Returns:
+            Tuple of chat IDs
+        """
+        global _productivity_all_chats
+        if _productivity_all_chats is None:
+            _productivity_all_chats = tuple(dict.fromkeys(
+                Settings.get_productivity_extra_chats() + Settings.get_productivity_temp_chats()
+            ))
+        return _productivity_all_chats
+
     # =========================================================================
     # CalDAV Calendar Settings
     # =========================================================================
@@ -637,6 +788,39 @@ class Settings(Model):
         else:
             Settings.set('personal_chat_id', str(chat_id))
 
+    @staticmethod
+    def get_resolved_personal_account(lookup: str) -> Optional[int]:
+        """Get the user ID previously resolved for a personal account.
+
+        Only the ID is kept: it never changes, while a username can.
+
+        Args:
+            lookup: The login that was resolved
+
+        Returns:
+            User ID, or None if `lookup` wasn't resolved yet
+        """
+        value = Settings.get('personal_account_resolved')
+        if not value:
+            return None
+        try:
+            data = json.loads(value)
+        except json.JSONDecodeError:
+            return None
+        if data.get('lookup') != lookup:
+            return None
+        return data.get('id')
+
+    @staticmethod
+    def set_resolved_personal_account(lookup: str, user_id: int) -> None:
+        """Remember which user ID a personal account login resolved to.
+
+        Args:
+            lookup: The login that was resolved
+            user_id: Resolved user ID
+        """
+        Settings.set('personal_account_resolved', json.dumps({'lookup': lookup, 'id': user_id}))
+
     # =========================================================================
     # ASAP Notification Settings
     # =========================================================================
@@ -762,10 +946,50 @@ class Schedule(Model):
             date_end=date_end
         )
 
+    def save(self, *args, **kwargs):
+        result = Model.save(self, *args, **kwargs)
+        Schedule.mark_changed()
+        return result
+
+    def delete(self, *args, **kwargs):
+        result = Model.delete(self, *args, **kwargs)
+        Schedule.mark_changed()
+        return result
+
+    @staticmethod
+    def invalidate_cache():
+        """Drop cached schedule rules so the next read hits the database"""
+        global _schedule_cache
+        _schedule_cache = None
+
+    @staticmethod
+    def mark_changed():
+        """Invalidate cached rules and wake tasks waiting on changed_event()"""
+        Schedule.invalidate_cache()
+        if _schedule_changed is not None:
+            _schedule_changed.set()
+
+    @staticmethod
+    def changed_event() -> asyncio.Event:
+        """Get the event that is set whenever schedule rules change"""
+        global _schedule_changed
+        if _schedule_changed is None:
+            _schedule_changed = asyncio.Event()
+        return _schedule_changed
+
     @staticmethod
     def get_all():
-        """Get all schedule rules ordered by priority"""
-        return Schedule().select(SQL().ORDER_BY('priority', 'DESC')) or []
+        """Get all schedule rules ordered by priority
+
+        Returns copies of the cached rows, so callers may edit and save them
+        without touching the cache (e.g. when a save fails).
+        """
+        global _schedule_cache, _schedule_cache_time
+        now = time.monotonic()
+        if _schedule_cache is None or now - _schedule_cache_time > SCHEDULE_CACHE_TTL:
+            _schedule_cache = Schedule().select(SQL().ORDER_BY('priority', 'DESC')) or []
+            _schedule_cache_time = now
+        return [copy.copy(rule) for rule in _schedule_cache]
 
     @staticmethod
     def get_overrides():
@@ -777,8 +1001,9 @@ class Schedule(Model):
     def delete_expired():
         """Delete all expired override rules"""
         deleted = 0
+        now = get_now()
         for schedule in Schedule.get_overrides():
-            if schedule.is_expired():
+            if schedule.is_expired(now):
                 schedule.delete()
                 deleted += 1
         return deleted
@@ -921,18 +1146,60 @@ class Schedule(Model):
         """Get the emoji_id that should be active right now based on schedule"""
         if now is None:
             now = get_now()
+        return Schedule._pick_emoji_id(Schedule.get_all(), now)
 
-        matching_rules = []
-        for schedule in Schedule.get_all():
-            if schedule.matches_now(now):
-                matching_rules.append(schedule)
+    @staticmethod
+    def _pick_emoji_id(rules, now):
+        """Get emoji_id of the highest priority rule in rules matching now"""
+        best = None
+        for schedule in rules:
+            if schedule.matches_now(now) and (best is None or schedule.priority > best.priority):
+                best = schedule
+        return int(best.emoji_id) if best else None
 
-        if not matching_rules:
-            return None
+    @staticmethod
+    def next_change_after(now=None, horizon_days=8):
+        """Find the next moment the scheduled emoji changes.
+
+        Only rule boundaries (start/end times, day changes) are checked,
+        so this is cheap enough to call after every transition.
+
+        Args:
+            now: Reference datetime (defaults to get_now())
+            horizon_days: How many days ahead to look
+
+        Returns:
+            Tuple (when, emoji_id). when is None if nothing changes within
+            the horizon; emoji_id is the emoji scheduled from that moment.
+        """
+        if now is None:
+            now = get_now()
+
+        rules = Schedule.get_all()
+        current = Schedule._pick_emoji_id(rules, now)
+        today = now.date()
 
-        # Return highest priority match
-        matching_rules.sort(key=lambda s: s.priority, reverse=True)
-        return int(matching_rules[0].emoji_id)
+        candidates = set()
+        for day_offset in range(horizon_days + 1):
+            day = today + timedelta(days=day_offset)
+            candidates.add(datetime.combine(day, dt_time(), tzinfo=now.tzinfo))
+            for rule in rules:
+                for value in (rule.time_start, rule.time_end):
+                    try:
+                        hour, minute = map(int, value.split(':'))
+                        boundary = datetime.combine(day, dt_time(hour, minute), tzinfo=now.tzinfo)
+                    except (ValueError, AttributeError):
+                        continue
+                    # Override end times are inclusive, so also check the next minute
+                    candidates.add(boundary)
+                    candidates.add(boundary + timedelta(minutes=1))
+
+        for when in sorted(c for c in candidates if c > now):
+            emoji_id = Schedule._pick_emoji_id(rules, when)
+            # No matching rule means the status is left as is
+            if emoji_id is not None and emoji_id != current:
+                return when, emoji_id
+        return None, current
 
     @staticmethod
     def is_scheduling_enabled():
@@ -943,6 +1210,7 @@ class Schedule(Model):
     def set_scheduling_enabled(enabled):
         """Enable or disable scheduling"""
         Settings.set('schedule_enabled', 'true' if enabled else 'false')
+        Schedule.mark_changed()
 
     @staticmethod
     def get_work_schedule():
@@ -4,9 +4,9 @@ Web routes for API endpoints.
 Provides health check and meeting API.
 """
 from quart import Blueprint, request, jsonify
-from telethon.tl.functions.account import UpdateEmojiStatusRequest
-from telethon.tl.types import EmojiStatus
 
+from bot_handlers import is_authorized
+from handlers import set_emoji_status
 from logging_config import logger
 from models import Schedule, Settings
 from config import config
@@ -35,12 +35,13 @@ def register_routes(app, client):
 async def health():
     """Health check endpoint for Docker/Kubernetes."""
     is_connected = _client.is_connected()
-    is_authorized = await _client.is_user_authorized() if is_connected else False
+    # Tracked auth state: set on sign-in, cleared on logout/revoked session
+    authorized = is_connected and is_authorized()
 
     status = {
-        "status": "ok" if is_connected and is_authorized else "degraded",
+        "status": "ok" if authorized else "degraded",
         "telethon_connected": is_connected,
-        "telethon_authorized": is_authorized,
+        "telethon_authorized": authorized,
     }
 
     status_code = 200 if status["status"] == "ok" else 503
@@ -97,9 +98,7 @@ async def meeting():
 
         # Immediately update emoji status
         try:
-            await _client(UpdateEmojiStatusRequest(
-                emoji_status=EmojiStatus(document_id=emoji_id)
-            ))
+            await set_emoji_status(_client, emoji_id)
             logger.info(f"Emoji status updated to {emoji_id}")
         except Exception as e:
             logger.error(f"Failed to update emoji status: {e}")
@@ -126,9 +125,7 @@ async def meeting():
             scheduled_emoji_id = Schedule.get_current_emoji_id()
             if scheduled_emoji_id:
                 try:
-                    await _client(UpdateEmojiStatusRequest(
-                        emoji_status=EmojiStatus(document_id=scheduled_emoji_id)
-                    ))
+                    await set_emoji_status(_client, scheduled_emoji_id)
                     logger.info(f"Emoji status restored to scheduled: {scheduled_emoji_id}")
                 except Exception as e:
                     logger.error(f"Failed to restore emoji status: {e}")
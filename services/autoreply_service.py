@@ -46,6 +46,27 @@ class AutoReplyService:
         Returns:
             True if auto-reply should be sent
         """
+        if not self.can_reply(emoji_status_id, reply_exists):
+            return False
+
+        # Rate limiting check
+        if not self.check_rate_limit(last_outgoing_message):
+            logger.debug("Rate limit not met, skipping auto-reply")
+            return False
+
+        return True
+
+    def can_reply(self, emoji_status_id: Optional[int], reply_exists: bool) -> bool:
+        """
+        Check the conditions that do not need the conversation history.
+
+        Args:
+            emoji_status_id: Current user's emoji status ID (None if not set)
+            reply_exists: Whether a reply template exists for this emoji
+
+        Returns:
+            False if no reply can be sent regardless of the rate limit
+        """
         # If emoji status is set, work/available emoji means "online" — skip
         if emoji_status_id is not None:
             work_emoji_id = Schedule.get_work_emoji_id()
@@ -58,14 +79,9 @@ class AutoReplyService:
             logger.debug(f"No reply template for emoji {emoji_status_id}")
             return False
 
-        # Rate limiting check
-        if not self._check_rate_limit(last_outgoing_message):
-            logger.debug("Rate limit not met, skipping auto-reply")
-            return False
-
         return True
 
-    def _check_rate_limit(self, last_outgoing_message: Optional[Any]) -> bool:
+    def check_rate_limit(self, last_outgoing_message: Optional[Any]) -> bool:
         """
         Check if enough time has passed since last outgoing message.
 
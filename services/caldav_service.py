@@ -25,6 +25,12 @@ except ImportError:
     CALDAV_AVAILABLE = False
     caldav = None
 
+# How long a calendar status may be served from cache when no event
+# start/end falls in between (picks up events created after the last fetch)
+STATUS_CACHE_MAX_AGE = timedelta(seconds=config.caldav_status_max_age)
+# Event end is inclusive in _is_event_active, so refetch just after it
+BOUNDARY_SKEW = timedelta(seconds=1)
+
 
 class CalendarEventType(Enum):
     """Type of calendar event based on calendar configuration."""
@@ -68,6 +74,32 @@ class CalDAVService:
         # Cache connection params to detect changes
         self._connected_url: Optional[str] = None
         self._connected_user: Optional[str] = None
+        # Cached result of check_calendar_status_with_priority(), valid until
+        # the next known event boundary
+        self._status_cache: Optional[tuple] = None
+        self._next_boundary: Optional[datetime] = None
+        self._scan_boundary: Optional[datetime] = None
+
+    @property
+    def next_boundary(self) -> Optional[datetime]:
+        """Time when the cached calendar status expires (None if not cached)."""
+        return self._next_boundary
+
+    def invalidate_status_cache(self):
+        """Force the next status check to query the CalDAV server."""
+        self._status_cache = None
+        self._next_boundary = None
+
+    def _note_boundary(self, when: datetime):
+        """Shrink the boundary of the scan in progress to `when` (ignored if already past)."""
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=self._tz)
+        if when <= datetime.now(self._tz):
+            # e.g. the start of an event that already ended (the search
+            # window reaches an hour back); it would expire the cache at once
+            return
+        if self._scan_boundary is not None and when < self._scan_boundary:
+            self._scan_boundary = when
 
     def is_configured(self) -> bool:
         """Check if CalDAV is properly configured (in Settings)."""
@@ -116,7 +148,8 @@ class CalDAVService:
             self._client = caldav.DAVClient(
                 url=url,
                 username=username,
-                password=password
+                password=password,
+                timeout=config.caldav_timeout
             )
 
             principal = self._client.principal()
@@ -149,6 +182,7 @@ class CalDAVService:
         self._connected_url = None
         self._connected_user = None
         self._last_event_uid = None
+        self.invalidate_status_cache()
 
     async def get_available_calendars(self) -> list[CalendarInfo]:
         """Get list of all available calendars on the server with their configured types."""
@@ -288,14 +322,20 @@ class CalDAVService:
                 for event in events:
                     try:
                         cal_event = self._parse_event(event, calendar.name, event_type)
-                        if cal_event and self._is_event_active(cal_event, now):
+                        if not cal_event:
+                            continue
+                        if self._is_event_active(cal_event, now):
+                            self._note_boundary(cal_event.end + BOUNDARY_SKEW)
                             return cal_event
+                        self._note_boundary(cal_event.start)
                     except Exception as e:
                         logger.warning(f"Error parsing event: {e}")
                         continue
 
             except Exception as e:
                 logger.warning(f"Error searching calendar {calendar.name}: {e}")
+                # Partial result - don't cache it
+                self._scan_boundary = None
                 continue
 
         return None
@@ -325,6 +365,7 @@ class CalDAVService:
             )
         except Exception as e:
             logger.error(f"Error fetching {event_type.value} events: {e}")
+            self._scan_boundary = None
             return None
 
     def _get_upcoming_events_sync(self, hours: int = 24) -> list[CalendarEvent]:
@@ -533,15 +574,37 @@ class CalDAVService:
             - (None, None) if no active events
 
         Absence events have higher priority than meeting events.
+
+        The result is cached until the nearest start/end of an event seen
+        during the fetch (at most STATUS_CACHE_MAX_AGE), so repeated checks
+        between calendar transitions don't hit the server.
         """
         if self._needs_reconnect():
             logger.info("CalDAV settings changed, reconnecting...")
             self.disconnect()
 
+        now = datetime.now(self._tz)
+        if self._status_cache is not None and now < self._next_boundary:
+            return self._status_cache
+
         if not self._all_calendars:
             if not await self.connect():
                 return None, None
 
+        self._scan_boundary = now + STATUS_CACHE_MAX_AGE
+        result = await self._fetch_calendar_status()
+
+        if self._scan_boundary is not None:
+            self._status_cache = result
+            self._next_boundary = self._scan_boundary
+        else:
+            self.invalidate_status_cache()
+        return result
+
+    async def _fetch_calendar_status(
+        self
+    ) -> Tuple[Optional[CalendarEventType], Optional[CalendarEvent]]:
+        """Query calendars for the active event, absence first."""
         # Check absence first (higher priority)
         absence_event = await self.get_current_event_by_type(CalendarEventType.ABSENCE)
         if absence_event:
@@ -576,6 +639,7 @@ class CalDAVService:
     def clear_state(self):
         """Clear internal state."""
         self._last_event_uid = None
+        self.invalidate_status_cache()
 
     async def test_connection(self) -> tuple[bool, str]:
         """Test CalDAV connection."""
@@ -40,6 +40,22 @@ class NotificationService:
         self.webhook_timeout = webhook_timeout
         # Track last ASAP notification time per sender_id
         self._last_asap_notification: dict[int, datetime] = {}
+        # Keep-alive HTTP session for webhooks (created lazily on the running loop)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared webhook session, creating it if needed."""
+        if self._session is None or self._session.closed:
+            timeout = aiohttp.ClientTimeout(total=self.webhook_timeout)
+            connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=75)
+            self._session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared webhook session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     def check_asap_cooldown(self, sender_id: int) -> bool:
         """
@@ -176,15 +192,14 @@ class NotificationService:
         }
 
         try:
-            timeout = aiohttp.ClientTimeout(total=self.webhook_timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, json=payload) as response:
-                    success = response.status == 200
-                    logger.info(
-                        f"Webhook POST to {url}: "
-                        f"status={response.status}, success={success}"
-                    )
-                    return success
+            session = self._get_session()
+            async with session.post(url, json=payload) as response:
+                success = response.status == 200
+                logger.info(
+                    f"Webhook POST to {url}: "
+                    f"status={response.status}, success={success}"
+                )
+                return success
         except asyncio.TimeoutError:
             logger.error(f"Webhook timeout after {self.webhook_timeout}s: {url}")
             return False
@@ -7,7 +7,7 @@ a summary of daily communication activity.
 import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterable, List, Dict, Any
 from zoneinfo import ZoneInfo
 
 from telethon.errors import FloodWaitError
@@ -134,7 +134,7 @@ class ProductivityService:
         self,
         client,
         date: Optional[datetime] = None,
-        extra_chat_ids: Optional[List[int]] = None
+        extra_chat_ids: Optional[Iterable[int]] = None
     ) -> DailySummary:
         """
         Collect all outgoing messages for a given day.
@@ -146,12 +146,13 @@ class ProductivityService:
         Args:
             client: Telethon client
             date: Date to collect messages for (defaults to today)
-            extra_chat_ids: List of chat IDs to always include (even if muted)
+            extra_chat_ids: Chat IDs to always include (even if muted); any iterable
 
         Returns:
             DailySummary with collected messages grouped by chat
         """
-        extra_chat_ids = extra_chat_ids or []
+        # Looked up once per dialog, so make membership O(1)
+        extra_chat_ids = frozenset(extra_chat_ids or ())
         day_start, day_end = self._get_today_range(date)
 
         logger.info(f"Collecting messages for {day_start.date()}")
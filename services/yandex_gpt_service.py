@@ -58,6 +58,22 @@ class YandexGPTService:
         # Detect auth type: IAM tokens usually start with "t1."
         self.is_iam_token = api_key.startswith("t1.")
 
+        # HTTP session reused across calls (created lazily on the running loop)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it if needed."""
+        if self._session is None or self._session.closed:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self._session = aiohttp.ClientSession(timeout=timeout)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def summarize_mention(
         self,
         messages: list[str],
@@ -143,19 +159,18 @@ class YandexGPTService:
         }
 
         try:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(YANDEX_GPT_URL, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # Extract text from response
-                        alternatives = data.get("result", {}).get("alternatives", [])
-                        if alternatives:
-                            return alternatives[0].get("message", {}).get("text", "")
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Yandex GPT API error {response.status}: {error_text}")
-                        return None
+            session = self._get_session()
+            async with session.post(YANDEX_GPT_URL, headers=headers, json=payload) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    # Extract text from response
+                    alternatives = data.get("result", {}).get("alternatives", [])
+                    if alternatives:
+                        return alternatives[0].get("message", {}).get("text", "")
+                else:
+                    error_text = await response.text()
+                    logger.error(f"Yandex GPT API error {response.status}: {error_text}")
+                    return None
         except aiohttp.ClientError as e:
             logger.error(f"Yandex GPT request failed: {e}")
             return None
@@ -393,3 +408,9 @@ def get_yandex_gpt_service() -> Optional[YandexGPTService]:
 
     logger.info(f"Yandex GPT service initialized (model: {config.yandex_gpt_model})")
     return _service_instance
+
+
+async def close_yandex_gpt_service() -> None:
+    """Close the HTTP session of the service instance, if one was created."""
+    if _service_instance is not None:
+        await _service_instance.close()
@@ -3,6 +3,7 @@ Shared pytest fixtures for telegram-assistant tests.
 
 All tests use mocks to avoid requiring actual Telegram/DB dependencies.
 """
+import logging
 import os
 import sys
 import sqlite3
@@ -29,6 +30,80 @@ def setup_test_environment():
     os.environ['SECRET_KEY'] = 'test_secret_key_for_sessions'
 
 
+# ============================================================================
+# Module Loading - import real project modules with stubbed dependencies
+# ============================================================================
+
+_STUBBED_PACKAGES = [
+    'telethon', 'telethon.events', 'telethon.errors', 'telethon.extensions',
+    'telethon.tl', 'telethon.tl.types', 'telethon.tl.functions',
+    'telethon.tl.functions.account', 'telethon.tl.functions.messages',
+    'telethon.sync', 'aiohttp', 'caldav', 'vobject',
+    'quart', 'hypercorn', 'hypercorn.config', 'hypercorn.asyncio',
+]
+
+_PROJECT_MODULES = ('config', 'logging_config', 'models', 'handlers',
+                    'bot_handlers', 'routes', 'main', 'services')
+
+
+class StubModel:
+    """Stand-in for sqlitemodel.Model: persistence methods are no-ops."""
+
+    def __init__(self, id=None, foreign_keys=False):
+        self.id = id
+
+    def save(self):
+        return self.id
+
+    def delete(self):
+        pass
+
+    def createTable(self):
+        pass
+
+    def select(self, sql):
+        return []
+
+    def selectOne(self, sql):
+        return None
+
+
+@pytest.fixture
+def load_module():
+    """
+    Import a real project module with third-party packages stubbed.
+
+    Project modules are re-imported fresh for every test, so module-level
+    caches start empty. sys.modules is restored afterwards.
+    """
+    import importlib
+    import types
+
+    sqlitemodel = types.ModuleType('sqlitemodel')
+    sqlitemodel.Model = StubModel
+    sqlitemodel.Database = MagicMock()
+    sqlitemodel.SQL = MagicMock()
+
+    app_logger = logging.getLogger('telegram-assistant')
+    app_handlers = list(app_logger.handlers)
+
+    with patch.dict(sys.modules):
+        sys.modules['sqlitemodel'] = sqlitemodel
+        for name in _STUBBED_PACKAGES:
+            sys.modules[name] = MagicMock()
+        sys.modules['uvloop'] = None  # fall back to the default event loop
+        for name in list(sys.modules):
+            if name.split('.')[0] in _PROJECT_MODULES:
+                del sys.modules[name]
+        yield importlib.import_module
+
+        # A fresh logging_config starts a listener on pytest's captured stdout
+        logging_config = sys.modules.get('logging_config')
+        if isinstance(logging_config, types.ModuleType):
+            logging_config.stop_logging()
+    app_logger.handlers[:] = app_handlers
+
+
 # ============================================================================
 # Database Fixtures (using raw SQLite)
 # ============================================================================
@@ -572,3 +572,115 @@ class TestCalendarEventWithCalendarName:
 
         assert events[0].calendar_name == "Work"
         assert events[1].calendar_name == "Personal"
+
+
+class TestStatusCache:
+    """Tests for caching calendar status until the next event boundary."""
+
+    @pytest.fixture
+    def make_service(self, load_module):
+        """Build a CalDAVService; ``fetch``, if given, replaces the server fetch."""
+        cds = load_module('services.caldav_service')
+
+        def make(fetch=None):
+            service = cds.CalDAVService()
+            service._needs_reconnect = lambda: False
+            service._all_calendars = [MagicMock()]
+            if fetch is not None:
+                service._fetch_calendar_status = fetch
+            return service
+        return make
+
+    @pytest.mark.asyncio
+    async def test_cached_until_boundary(self, make_service):
+        """Second check within the boundary doesn't query the server."""
+        fetch = AsyncMock(return_value=(None, None))
+        service = make_service(fetch)
+
+        assert await service.check_calendar_status_with_priority() == (None, None)
+        assert await service.check_calendar_status_with_priority() == (None, None)
+        assert fetch.await_count == 1
+        assert service.next_boundary is not None
+
+    @pytest.mark.asyncio
+    async def test_cached_at_most_status_max_age(self, make_service):
+        """Without upcoming events, the status is trusted for CALDAV_STATUS_MAX_AGE (60s)."""
+        fetch = AsyncMock(return_value=(None, None))
+        service = make_service(fetch)
+        before = datetime.now(ZoneInfo("UTC"))
+
+        await service.check_calendar_status_with_priority()
+
+        assert service.next_boundary - before <= timedelta(seconds=61)
+
+    @pytest.mark.asyncio
+    async def test_past_event_keeps_boundary_in_future(self, make_service, load_module):
+        """An event that already ended doesn't pull the boundary into the past."""
+        cds = load_module('services.caldav_service')
+        now = datetime.now(ZoneInfo("UTC"))
+        ended = cds.CalendarEvent(
+            uid="past", summary="Standup", start=now - timedelta(minutes=50),
+            end=now - timedelta(minutes=20), calendar_name="Work",
+        )
+        calendar = MagicMock()
+        calendar.search.return_value = [MagicMock()]
+        service = make_service()
+        service._get_calendars_by_type = lambda event_type: [calendar]
+        service._parse_event = lambda event, name, event_type=None: ended
+
+        assert await service.check_calendar_status_with_priority() == (None, None)
+        assert await service.check_calendar_status_with_priority() == (None, None)
+
+        assert service.next_boundary > now
+        # Absence and meeting calendars are each searched once, then cached
+        assert calendar.search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_boundary_shrinks_to_upcoming_event(self, make_service):
+        """An event starting soon moves the boundary to its start."""
+        starts_at = datetime.now(ZoneInfo("UTC")) + timedelta(seconds=30)
+
+        async def fetch():
+            service._note_boundary(starts_at)
+            return None, None
+
+        service = make_service(fetch)
+        await service.check_calendar_status_with_priority()
+
+        assert service.next_boundary == starts_at
+
+    @pytest.mark.asyncio
+    async def test_expired_boundary_refetches(self, make_service):
+        """Once the boundary has passed, the server is queried again."""
+        fetch = AsyncMock(return_value=(None, None))
+        service = make_service(fetch)
+
+        await service.check_calendar_status_with_priority()
+        service._next_boundary = datetime.now(ZoneInfo("UTC")) - timedelta(seconds=1)
+        await service.check_calendar_status_with_priority()
+
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_not_cached(self, make_service):
+        """A fetch that hit an error is not cached."""
+        async def fetch():
+            service._scan_boundary = None
+            return None, None
+
+        service = make_service(fetch)
+        await service.check_calendar_status_with_priority()
+
+        assert service.next_boundary is None
+
+    @pytest.mark.asyncio
+    async def test_clear_state_invalidates_cache(self, make_service):
+        """Settings changes via clear_state() force a refetch."""
+        fetch = AsyncMock(return_value=(None, None))
+        service = make_service(fetch)
+
+        await service.check_calendar_status_with_priority()
+        service.clear_state()
+        await service.check_calendar_status_with_priority()
+
+        assert fetch.await_count == 2
@@ -186,3 +186,38 @@ class TestOptionalWebhookUrl:
         env_value = 'https://example.com/webhook'
         webhook_url = env_value or None
         assert webhook_url == 'https://example.com/webhook'
+
+
+class TestCredentialFormat:
+    """Tests for credential format checks in Config.validate()."""
+
+    @pytest.fixture
+    def make_config(self):
+        """Build a Config with valid credentials, overriding selected fields."""
+        from config import Config
+
+        def make(**overrides):
+            values = {
+                'api_id': 12345,
+                'api_hash': '0123456789abcdef0123456789abcdef',
+                'personal_tg_login': 'test_user',
+                'bot_token': None,
+            }
+            values.update(overrides)
+            return Config(**values)
+        return make
+
+    def test_valid_credentials_pass(self, make_config):
+        """Test well-formed API hash and bot token produce no errors."""
+        config = make_config(bot_token='123456:AAHdqTcvCH1vGWJxfSeofSAs0K5PALDsaw')
+        assert config.validate() == []
+
+    def test_malformed_api_hash_rejected(self, make_config):
+        """Test API hash that is not 32 hex characters is rejected."""
+        config = make_config(api_hash='not-a-hash')
+        assert any('API_HASH' in e for e in config.validate())
+
+    def test_malformed_bot_token_rejected(self, make_config):
+        """Test bot token without '<id>:<secret>' shape is rejected."""
+        config = make_config(bot_token='secret-without-id')
+        assert any('BOT_TOKEN' in e for e in config.validate())
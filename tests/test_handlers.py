@@ -4,6 +4,7 @@ Unit tests for Telethon event handler logic.
 These tests validate the handler behavior patterns using mocks,
 without requiring actual Telethon dependencies.
 """
+import asyncio
 import os
 import sys
 from datetime import datetime, timedelta, timezone
@@ -514,3 +515,265 @@ class TestDebugOutgoingLogic:
         captured = capsys.readouterr()
         assert '[DEBUG]' in captured.out
         assert 'Test outgoing message' in captured.out
+
+
+class TestBackgroundWorkers:
+    """Tests for starting the pending-mentions checker and ASAP workers."""
+
+    def test_workers_start_once(self, load_module):
+        """Repeated calls don't start another set of workers on the same queue."""
+        handlers = load_module('handlers')
+        started = []
+
+        def start_task(coro):
+            started.append(coro.__name__)
+            coro.close()
+
+        handlers.start_background_workers(start_task)
+        handlers.start_background_workers(start_task)
+
+        assert started.count('_process_pending_mentions') == 1
+        assert started.count('_asap_worker') == handlers.ASAP_WORKERS
+
+    def test_register_handlers_starts_no_tasks(self, load_module):
+        """Registering handlers leaves task creation to the caller."""
+        handlers = load_module('handlers')
+        client = MagicMock()
+
+        handlers.register_handlers(client)
+
+        assert client.add_event_handler.called
+        assert handlers._workers_started is False
+
+
+class TestGetMeCached:
+    """Tests for the get_me() cache in handlers."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_result_within_ttl(self, load_module, mock_user):
+        """A second call within the TTL doesn't hit the server."""
+        handlers = load_module('handlers')
+        client = MagicMock()
+        client.get_me = AsyncMock(return_value=mock_user)
+
+        assert await handlers.get_me_cached(client) is mock_user
+        assert await handlers.get_me_cached(client) is mock_user
+        client.get_me.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_refetches_after_ttl(self, load_module, mock_user):
+        """Once the TTL has passed, get_me() is called again."""
+        handlers = load_module('handlers')
+        client = MagicMock()
+        client.get_me = AsyncMock(return_value=mock_user)
+
+        await handlers.get_me_cached(client, ttl=0.01)
+        await asyncio.sleep(0.02)
+        await handlers.get_me_cached(client, ttl=0.01)
+
+        assert client.get_me.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_refetch(self, load_module, mock_user):
+        """invalidate_me_cache() drops the cached result."""
+        handlers = load_module('handlers')
+        client = MagicMock()
+        client.get_me = AsyncMock(return_value=mock_user)
+
+        await handlers.get_me_cached(client)
+        handlers.invalidate_me_cache()
+        await handlers.get_me_cached(client)
+
+        assert client.get_me.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_own_user_update_invalidates(self, load_module, mock_user):
+        """An update for our own user drops the cache; others don't."""
+        handlers = load_module('handlers')
+        load_module('bot_handlers').set_owner_id(mock_user.id)
+        client = MagicMock()
+        client.get_me = AsyncMock(return_value=mock_user)
+        registry = handlers.HandlerRegistry(client)
+
+        await handlers.get_me_cached(client)
+        await registry.own_user_updated(MagicMock(user_id=mock_user.id + 1))
+        assert handlers._me_cache is not None
+
+        await registry.own_user_updated(MagicMock(user_id=mock_user.id))
+        assert handlers._me_cache is None
+
+
+class TestEmojiStatusTracker:
+    """Tests for the emoji status we last set or read."""
+
+    @pytest.fixture
+    def client(self, mock_user_with_status):
+        client = AsyncMock()
+        client.get_me = AsyncMock(return_value=mock_user_with_status)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_read_once_then_tracked(self, load_module, client, mock_user_with_status):
+        """The status is read from Telegram once, then taken from our own updates."""
+        handlers = load_module('handlers')
+
+        assert await handlers.get_emoji_status(client) == mock_user_with_status.emoji_status.document_id
+        await handlers.set_emoji_status(client, 42)
+
+        assert await handlers.get_emoji_status(client) == 42
+        client.get_me.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_set_skips_known_status(self, load_module, client):
+        """Setting the status we already have sends no request."""
+        handlers = load_module('handlers')
+
+        await handlers.set_emoji_status(client, 42)
+        await handlers.set_emoji_status(client, 42)
+
+        assert client.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_external_change_resets_tracker(self, load_module, client, mock_user_with_status):
+        """A status change made in the app is re-read instead of trusting our last update."""
+        handlers = load_module('handlers')
+        load_module('bot_handlers').set_owner_id(mock_user_with_status.id)
+        registry = handlers.HandlerRegistry(client)
+        await handlers.set_emoji_status(client, 42)
+
+        # The user picks another status in the app; Telegram sends UpdateUserEmojiStatus
+        await registry.own_user_updated(MagicMock(user_id=mock_user_with_status.id))
+
+        assert await handlers.get_emoji_status(client) == mock_user_with_status.emoji_status.document_id
+        await handlers.set_emoji_status(client, 42)
+        assert client.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rereads_after_max_age(self, load_module, client):
+        """A tracked status older than max_age is re-read from Telegram."""
+        handlers = load_module('handlers')
+
+        await handlers.get_emoji_status(client, max_age=0.01)
+        await asyncio.sleep(0.02)
+        await handlers.get_emoji_status(client, max_age=0.01)
+
+        assert client.get_me.await_count == 2
+
+
+class TestLastOutgoingCache:
+    """Tests for the per-chat last outgoing message cache used for rate limiting."""
+
+    @pytest.fixture
+    def handlers(self, load_module, monkeypatch, mock_user):
+        """handlers with auto-reply enabled and a reply template for any status."""
+        handlers = load_module('handlers')
+        settings = MagicMock()
+        settings.is_autoreply_enabled.return_value = True
+        reply = MagicMock()
+        reply.message = 'Away'
+        replies = MagicMock()
+        replies.get_by_emoji.return_value = reply
+        monkeypatch.setattr(handlers, 'Settings', settings)
+        monkeypatch.setattr(handlers, 'Reply', replies)
+        monkeypatch.setattr(handlers._autoreply_service, 'can_reply', lambda *a, **kw: True)
+        handlers._me_cache = (mock_user, float('inf'))
+        return handlers
+
+    def _incoming(self, chat_id):
+        event = MagicMock()
+        event.chat_id = chat_id
+        event.get_sender = AsyncMock(return_value=MagicMock(bot=False, username=f'user{chat_id}', id=chat_id))
+        return event
+
+    def test_evicts_least_recently_used_chat(self, handlers, monkeypatch):
+        """The cache keeps only the most recently used chats."""
+        monkeypatch.setattr(handlers, '_LAST_OUTGOING_CACHE_SIZE', 2)
+
+        handlers._remember_outgoing(1, 'a')
+        handlers._remember_outgoing(2, 'b')
+        handlers._remember_outgoing(1, 'c')
+        handlers._remember_outgoing(3, 'd')
+
+        assert list(handlers._last_outgoing) == [1, 3]
+        assert handlers._last_outgoing[1] == 'c'
+
+    @pytest.mark.asyncio
+    async def test_history_fetched_only_for_unseen_chat(self, handlers, mock_telegram_client):
+        """After the first reply, the rate limit uses the cached outgoing message."""
+        mock_telegram_client.get_messages = AsyncMock(return_value=[])
+        mock_telegram_client.send_message = AsyncMock(
+            return_value=MagicMock(date=datetime.now(timezone.utc))
+        )
+        registry = handlers.HandlerRegistry(mock_telegram_client)
+
+        await registry.new_messages(self._incoming(42))
+        await registry.new_messages(self._incoming(42))
+
+        mock_telegram_client.get_messages.assert_awaited_once()
+        assert mock_telegram_client.send_message.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_recent_outgoing_blocks_reply(self, handlers, mock_telegram_client):
+        """A message we just sent (seen via track_outgoing) blocks the auto-reply."""
+        mock_telegram_client.get_messages = AsyncMock()
+        registry = handlers.HandlerRegistry(mock_telegram_client)
+        outgoing = MagicMock()
+        outgoing.chat_id = 42
+        outgoing.message.date = datetime.now(timezone.utc)
+
+        await registry.track_outgoing(outgoing)
+        await registry.new_messages(self._incoming(42))
+
+        mock_telegram_client.get_messages.assert_not_awaited()
+        mock_telegram_client.send_message.assert_not_awaited()
+
+
+class TestAsapQueue:
+    """Tests for handing ASAP follow-ups to the workers."""
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_follow_up(self, load_module, monkeypatch):
+        """When the queue is full the follow-up is dropped and the handler returns."""
+        handlers = load_module('handlers')
+        monkeypatch.setattr(handlers, '_send_bot_notification', AsyncMock(return_value=True))
+        monkeypatch.setattr(handlers, 'Settings', MagicMock(get_asap_webhook_url=MagicMock(return_value=None)))
+        monkeypatch.setattr(handlers, 'logger', MagicMock())
+        monkeypatch.setattr(handlers, 'ASAP_QUEUE_SIZE', 1)
+        registry = handlers.HandlerRegistry(MagicMock())
+
+        await registry._send_asap_notification(MagicMock(), MagicMock(), 'first', 1)
+        await registry._send_asap_notification(MagicMock(), MagicMock(), 'second', 2)
+
+        queue = handlers._get_asap_queue()
+        assert queue.qsize() == 1
+        assert queue.get_nowait()[1] == 'first'
+        handlers.logger.warning.assert_called_once()
+        assert 'queue full' in handlers.logger.warning.call_args[0][0]
+        assert 2 in handlers._notification_service._last_asap_notification
+
+
+class TestOwnUserUpdateTypes:
+    """Tests for the Raw update types that drop our cached user."""
+
+    def test_includes_emoji_status_update(self, load_module):
+        """UpdateUserEmojiStatus is watched when Telethon provides it."""
+        handlers = load_module('handlers')
+
+        assert handlers._own_user_update_types() == (
+            handlers.types.UpdateUser, handlers.types.UpdateUserEmojiStatus
+        )
+
+    def test_falls_back_without_emoji_status_update(self, load_module, monkeypatch):
+        """Older layers without UpdateUserEmojiStatus still get UpdateUser."""
+        handlers = load_module('handlers')
+        monkeypatch.setattr(handlers, 'types', MagicMock(spec=['UpdateUser']))
+
+        assert handlers._own_user_update_types() == (handlers.types.UpdateUser,)
+
+    def test_installed_telethon_has_emoji_status_update(self):
+        """The pinned Telethon sends UpdateUserEmojiStatus for status changes."""
+        telethon_types = pytest.importorskip('telethon.tl.types')
+        if isinstance(telethon_types, MagicMock):
+            pytest.skip("telethon is stubbed by another test module")
+
+        assert hasattr(telethon_types, 'UpdateUserEmojiStatus')
@@ -0,0 +1,210 @@
+"""
+Unit tests for logging_config.py.
+
+Handlers and filters are exercised directly; setup_logging() is run on a
+separate logger name writing to an in-memory stream.
+"""
+import io
+import logging
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _record(level=logging.WARNING, msg='disk %s full', args=('/data',), name='test'):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def logging_config(load_module):
+    return load_module('logging_config')
+
+
+@pytest.fixture
+def clock(logging_config, monkeypatch):
+    """Controllable time.monotonic() for logging_config."""
+    clock = MagicMock()
+    clock.monotonic.return_value = 1000.0
+    monkeypatch.setattr(logging_config, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def app_logger(logging_config, monkeypatch, request):
+    """Run setup_logging() on a logger of its own, writing to a StringIO."""
+    stream = io.StringIO()
+    monkeypatch.setattr(sys, 'stdout', stream)
+    logger = logging_config.setup_logging(name=f'telegram-assistant-test.{request.node.name}')
+    yield logger, stream
+    logging_config.stop_logging()
+    logger.handlers.clear()
+
+
+class TestDedupFilter:
+    """Tests for suppressing repeated warning lines."""
+
+    def test_repeats_within_window_suppressed(self, logging_config, clock):
+        """The same warning within the window is dropped, then counted."""
+        dedup = logging_config.DedupFilter(window=5.0)
+
+        assert dedup.filter(_record()) is True
+        clock.monotonic.return_value += 1
+        assert dedup.filter(_record()) is False
+        assert dedup.filter(_record()) is False
+
+        clock.monotonic.return_value += 5
+        record = _record()
+        assert dedup.filter(record) is True
+        assert record.getMessage() == 'disk /data full (2 identical message(s) suppressed)'
+
+    def test_below_warning_never_suppressed(self, logging_config, clock):
+        """Repeated info lines are legitimate and always pass."""
+        dedup = logging_config.DedupFilter()
+
+        assert all(dedup.filter(_record(logging.INFO)) for _ in range(3))
+        assert len(dedup._seen) == 0
+
+    def test_distinct_messages_pass(self, logging_config, clock):
+        """Lines with different arguments are not duplicates."""
+        dedup = logging_config.DedupFilter()
+
+        assert dedup.filter(_record(args=('/data',))) is True
+        assert dedup.filter(_record(args=('/tmp',))) is True
+
+    def test_bounded_by_dropping_oldest(self, logging_config, clock, monkeypatch):
+        """Within the window, the oldest line is forgotten once MAX_KEYS is exceeded."""
+        monkeypatch.setattr(logging_config.DedupFilter, 'MAX_KEYS', 2)
+        dedup = logging_config.DedupFilter()
+
+        for path in ('/a', '/b', '/c'):
+            dedup.filter(_record(args=(path,)))
+
+        assert len(dedup._seen) == 2
+        assert dedup.filter(_record(args=('/a',))) is True
+        assert dedup.filter(_record(args=('/c',))) is False
+
+    def test_runs_on_listener_handler(self, logging_config, app_logger):
+        """setup_logging() dedups on the listener side, not in the queue handler."""
+        logger, stream = app_logger
+        queue_handler = logger.handlers[0]
+        listener = logging_config._listeners[-1]
+
+        assert not any(isinstance(f, logging_config.DedupFilter) for f in queue_handler.filters)
+        assert any(isinstance(f, logging_config.DedupFilter) for f in listener.handlers[0].filters)
+
+        for _ in range(3):
+            logger.warning("disk full")
+            logger.info("tick")
+        logging_config.stop_logging()
+
+        output = stream.getvalue()
+        assert output.count("disk full") == 1
+        assert output.count("tick") == 3
+
+
+class _CountingStream(io.StringIO):
+    """StringIO that counts write() calls."""
+
+    writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+class TestBufferedStreamHandler:
+    """Tests for batching formatted records into one write."""
+
+    def test_flushes_at_capacity(self, logging_config, clock):
+        """Records are held until capacity is reached, then written at once."""
+        stream = _CountingStream()
+        handler = logging_config.BufferedStreamHandler(stream, capacity=3, flush_interval=60)
+
+        handler.handle(_record(msg='one', args=None))
+        handler.handle(_record(msg='two', args=None))
+        assert stream.getvalue() == ''
+
+        handler.handle(_record(msg='three', args=None))
+        assert stream.getvalue() == 'one\ntwo\nthree\n'
+        assert stream.writes == 1
+
+    def test_flushes_after_interval(self, logging_config, clock):
+        """A record arriving after flush_interval writes out the buffer."""
+        stream = _CountingStream()
+        handler = logging_config.BufferedStreamHandler(stream, capacity=64, flush_interval=0.1)
+
+        handler.handle(_record(msg='one', args=None))
+        assert stream.getvalue() == ''
+
+        clock.monotonic.return_value += 0.1
+        handler.handle(_record(msg='two', args=None))
+        assert stream.getvalue() == 'one\ntwo\n'
+
+    def test_flush_writes_pending_records(self, logging_config, clock):
+        """flush() writes whatever is buffered."""
+        stream = _CountingStream()
+        handler = logging_config.BufferedStreamHandler(stream, capacity=64, flush_interval=60)
+
+        handler.handle(_record(msg='one', args=None))
+        handler.flush()
+        handler.flush()
+
+        assert stream.getvalue() == 'one\n'
+        assert stream.writes == 1
+
+
+class TestQueueListener:
+    """Tests for the listener thread and shutdown draining."""
+
+    def test_flushes_when_queue_runs_dry(self, logging_config):
+        """An idle listener writes out records below capacity without waiting."""
+        import queue
+        import threading
+
+        stream = io.StringIO()
+        handler = logging_config.BufferedStreamHandler(stream, capacity=64, flush_interval=60)
+        log_queue = queue.Queue()
+        listener = logging_config._FlushingQueueListener(log_queue, handler)
+        flushed = threading.Event()
+        original_flush = handler.flush
+
+        def flush():
+            original_flush()
+            if stream.getvalue():
+                flushed.set()
+        handler.flush = flush
+
+        listener.start()
+        try:
+            log_queue.put(_record(msg='one', args=None))
+            assert flushed.wait(timeout=2)
+        finally:
+            listener.stop()
+        assert stream.getvalue() == 'one\n'
+
+    def test_stop_logging_drains_queue(self, logging_config, app_logger):
+        """stop_logging() writes every queued record and stops the listener."""
+        logger, stream = app_logger
+
+        for i in range(100):
+            logger.info("line %d", i)
+        logging_config.stop_logging()
+
+        assert stream.getvalue().count("line") == 100
+        assert "line 99" in stream.getvalue()
+        assert logging_config._listeners == []
+
+    def test_stop_logging_runs_at_exit(self, load_module, monkeypatch):
+        """stop_logging() is registered to run at interpreter exit."""
+        import atexit
+        register = MagicMock()
+        monkeypatch.setattr(atexit, 'register', register)
+
+        logging_config = load_module('logging_config')
+
+        register.assert_any_call(logging_config.stop_logging)
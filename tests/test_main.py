@@ -0,0 +1,290 @@
+"""
+Unit tests for the background dispatcher in main.py.
+
+main is imported for real, with Telethon, Quart and the other third-party
+packages stubbed (see the load_module fixture).
+"""
+import asyncio
+import os
+import sys
+from datetime import timedelta
+from unittest.mock import MagicMock, AsyncMock
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def main_module(load_module, monkeypatch):
+    """main with authorization granted and the three checks replaced."""
+    main = load_module('main')
+    monkeypatch.setattr(main, 'wait_until_authorized', AsyncMock())
+    monkeypatch.setattr(main, '_end_calendar_state', MagicMock())
+    monkeypatch.setattr(main, 'check_schedule', AsyncMock(return_value=3600))
+    monkeypatch.setattr(main, 'check_productivity_summary', AsyncMock(return_value=3600))
+    monkeypatch.setattr(main, 'check_calendar', AsyncMock(return_value=3600))
+    return main
+
+
+async def _run_dispatcher(main, seconds, while_running=None):
+    """Run background_dispatcher() for a while, then cancel it."""
+    task = asyncio.ensure_future(main.background_dispatcher())
+    await asyncio.sleep(0)
+    if while_running is not None:
+        await while_running()
+    await asyncio.sleep(seconds)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+class TestBackgroundDispatcher:
+    """Tests for per-check deadlines, wake-ups and retry backoff."""
+
+    @pytest.mark.asyncio
+    async def test_runs_each_check_on_its_own_deadline(self, main_module):
+        """A check asking for a short delay re-runs without re-running the others."""
+        main_module.check_schedule.return_value = 0.02
+
+        await _run_dispatcher(main_module, 0.15)
+
+        assert main_module.check_schedule.await_count >= 3
+        assert main_module.check_productivity_summary.await_count == 1
+        assert main_module.check_calendar.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_settings_change_wakes_only_that_check(self, main_module):
+        """Setting the productivity config event re-runs the productivity check early."""
+        async def change_settings():
+            await asyncio.sleep(0.02)
+            main_module.Settings.config_event('productivity').set()
+
+        await _run_dispatcher(main_module, 0.05, change_settings)
+
+        assert main_module.check_productivity_summary.await_count == 2
+        assert main_module.check_schedule.await_count == 1
+        assert main_module.check_calendar.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_check_backs_off(self, main_module, monkeypatch):
+        """A failing check is retried with doubling delays, capped at the maximum."""
+        monkeypatch.setattr(main_module, 'CHECK_RETRY_MIN_SECONDS', 0.01)
+        monkeypatch.setattr(main_module, 'CHECK_RETRY_MAX_SECONDS', 0.04)
+        loop = asyncio.get_running_loop()
+        calls = []
+
+        async def failing():
+            calls.append(loop.time())
+            raise RuntimeError("boom")
+        monkeypatch.setattr(main_module, 'check_calendar', failing)
+
+        await _run_dispatcher(main_module, 0.2)
+
+        gaps = [b - a for a, b in zip(calls, calls[1:])]
+        assert len(gaps) >= 4
+        assert gaps[0] < gaps[2]
+        assert max(gaps) < 0.04 + 0.03
+
+    @pytest.mark.asyncio
+    async def test_slow_check_does_not_delay_others(self, main_module, monkeypatch):
+        """A long-running check neither blocks the others nor gets started twice."""
+        started = []
+        release = asyncio.Event()
+
+        async def slow_summary():
+            started.append(True)
+            await release.wait()
+            return 3600
+        monkeypatch.setattr(main_module, 'check_productivity_summary', slow_summary)
+        main_module.check_schedule.return_value = 0.02
+
+        async def change_settings():
+            await asyncio.sleep(0.02)
+            main_module.Settings.config_event('productivity').set()
+
+        await _run_dispatcher(main_module, 0.15, change_settings)
+
+        assert main_module.check_schedule.await_count >= 3
+        assert len(started) == 1
+
+    @pytest.mark.asyncio
+    async def test_wake_during_run_reruns_after_finish(self, main_module, monkeypatch):
+        """A settings change while its check runs triggers one more run afterwards."""
+        calls = []
+
+        async def summary():
+            calls.append(True)
+            await asyncio.sleep(0.05)
+            return 3600
+        monkeypatch.setattr(main_module, 'check_productivity_summary', summary)
+
+        async def change_settings():
+            await asyncio.sleep(0.01)
+            main_module.Settings.config_event('productivity').set()
+
+        await _run_dispatcher(main_module, 0.2, change_settings)
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_running_checks(self, main_module, monkeypatch):
+        """Cancelling the dispatcher cancels checks still in progress."""
+        cancelled = []
+
+        async def hanging():
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        monkeypatch.setattr(main_module, 'check_calendar', hanging)
+
+        await _run_dispatcher(main_module, 0.02)
+
+        assert cancelled == [True]
+
+    @pytest.mark.asyncio
+    async def test_cancel_ends_calendar_state(self, main_module):
+        """Cancelling the dispatcher clears any active calendar status."""
+        await _run_dispatcher(main_module, 0.01)
+
+        main_module._end_calendar_state.assert_called_once()
+
+
+class TestCheckSchedule:
+    """Tests for applying the scheduled emoji status."""
+
+    @pytest.fixture
+    def main_module(self, load_module, monkeypatch):
+        """main with a schedule that wants emoji 42 and no upcoming change."""
+        main = load_module('main')
+        schedule = MagicMock()
+        schedule.is_scheduling_enabled.return_value = True
+        schedule.get_current_emoji_id.return_value = 42
+        schedule.delete_expired.return_value = 0
+        schedule.next_change_after.return_value = (None, None)
+        monkeypatch.setattr(main, 'Schedule', schedule)
+        return main
+
+    @pytest.fixture
+    def user(self):
+        user = MagicMock()
+        user.id = 123456789
+        user.emoji_status = MagicMock(document_id=42)
+        return user
+
+    @pytest.fixture
+    def client(self, main_module, monkeypatch, user):
+        client = AsyncMock()
+        client.get_me = AsyncMock(return_value=user)
+        monkeypatch.setattr(main_module, 'client', client)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_matching_status_left_alone(self, main_module, client):
+        """No request is sent while the status matches the schedule."""
+        await main_module.check_schedule()
+        await main_module.check_schedule()
+
+        client.get_me.assert_awaited_once()
+        assert client.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_status_changed_elsewhere_is_corrected(self, load_module, main_module, client, user):
+        """A status set outside set_emoji_status (e.g. in the app) is put back."""
+        handlers = load_module('handlers')
+        load_module('bot_handlers').set_owner_id(user.id)
+        await main_module.check_schedule()
+
+        # The user picks another status in the Telegram app
+        user.emoji_status = MagicMock(document_id=7)
+        await handlers.HandlerRegistry(client).own_user_updated(MagicMock(user_id=user.id))
+        await main_module.check_schedule()
+
+        assert client.await_count == 1
+        request = client.await_args[0][0]
+        assert request is handlers.UpdateEmojiStatusRequest.return_value
+        handlers.EmojiStatus.assert_called_with(document_id=42)
+
+
+class TestCheckCalendarDelay:
+    """Tests for how long check_calendar() asks the dispatcher to wait."""
+
+    @pytest.fixture
+    def main_module(self, load_module, monkeypatch):
+        """main with calendar sync on and no active event."""
+        main = load_module('main')
+        settings = MagicMock()
+        settings.is_caldav_configured.return_value = True
+        settings.is_calendar_sync_enabled.return_value = True
+        settings.get.return_value = None
+        settings.get_absence_emoji_id.return_value = None
+        monkeypatch.setattr(main, 'Settings', settings)
+        service = MagicMock()
+        service.check_calendar_status_with_priority = AsyncMock(return_value=(None, None))
+        monkeypatch.setattr(main, 'caldav_service', service)
+        return main
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('offset', [None, -3000, 0])
+    async def test_missing_or_past_boundary_uses_regular_interval(self, main_module, offset):
+        """Without a future boundary the check waits CALDAV_CHECK_INTERVAL, not the 1s floor."""
+        main_module.caldav_service.next_boundary = (
+            None if offset is None else main_module.get_now() + timedelta(seconds=offset)
+        )
+
+        assert await main_module.check_calendar() == main_module.config.caldav_check_interval
+
+    @pytest.mark.asyncio
+    async def test_future_boundary_sets_delay(self, main_module):
+        """A boundary ahead is waited for, within the min/max bounds."""
+        main_module.caldav_service.next_boundary = main_module.get_now() + timedelta(seconds=30)
+
+        delay = await main_module.check_calendar()
+
+        assert 28 < delay <= 30
+
+
+class TestPersonalAccount:
+    """Tests for resolving the personal account used for bot access."""
+
+    @pytest.fixture
+    def main_module(self, load_module, monkeypatch):
+        main = load_module('main')
+        client = MagicMock()
+        client.get_entity = AsyncMock(return_value=MagicMock(id=555, username='old_name'))
+        monkeypatch.setattr(main, 'client', client)
+        return main
+
+    @pytest.mark.asyncio
+    async def test_login_resolved_once_to_id(self, main_module):
+        """The login is resolved once; only the user ID is stored."""
+        assert await main_module._resolve_personal_account('personal') == 555
+        assert await main_module._resolve_personal_account('personal') == 555
+
+        main_module.client.get_entity.assert_awaited_once_with('personal')
+        assert 'old_name' not in main_module.Settings.get('personal_account_resolved')
+
+    @pytest.mark.asyncio
+    async def test_env_login_matched_by_id_only(self, load_module, main_module, monkeypatch):
+        """A resolved login sets the ID and no username that could go stale."""
+        bot_handlers = load_module('bot_handlers')
+        monkeypatch.setattr(main_module.config, 'personal_tg_login', 'personal')
+
+        await main_module._init_personal_account()
+
+        assert bot_handlers.get_personal_id() == 555
+        assert bot_handlers._personal_username is None
+
+    @pytest.mark.asyncio
+    async def test_settings_chat_id_needs_no_lookup(self, load_module, main_module, monkeypatch):
+        """A chat ID configured via the bot is used as-is, without get_entity()."""
+        bot_handlers = load_module('bot_handlers')
+        monkeypatch.setattr(main_module.Settings, 'get_personal_chat_id', staticmethod(lambda: 777))
+
+        await main_module._init_personal_account()
+
+        assert bot_handlers.get_personal_id() == 777
+        main_module.client.get_entity.assert_not_awaited()
@@ -6,6 +6,10 @@ actual sqlitemodel/telethon dependencies.
 """
 import os
 import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
 import pytest
 
 # Add project root to path
@@ -385,3 +389,230 @@ class TestAsapNotificationLogic:
         )
 
         assert should_notify is False
+
+
+class TestScheduleNextChangeAfter:
+    """Tests for Schedule.next_change_after() on the real model."""
+
+    @pytest.fixture
+    def models(self, load_module):
+        return load_module('models')
+
+    @pytest.fixture
+    def use_rules(self, models, monkeypatch):
+        """Make Schedule.get_all() return the given rules."""
+        def use(*rules):
+            monkeypatch.setattr(models.Schedule, 'get_all', staticmethod(lambda: list(rules)))
+        return use
+
+    def _rule(self, models, emoji_id, time_start, time_end, days=range(7),
+              priority=0, date_start=None, date_end=None):
+        rule = models.Schedule()
+        rule.emoji_id = str(emoji_id)
+        rule.days = ','.join(map(str, days))
+        rule.time_start = time_start
+        rule.time_end = time_end
+        rule.priority = priority
+        rule.date_start = date_start
+        rule.date_end = date_end
+        return rule
+
+    def test_no_schedules(self, models, use_rules):
+        """Without rules nothing ever changes."""
+        use_rules()
+        now = datetime(2026, 1, 5, 12, 0, tzinfo=models._tz)
+
+        assert models.Schedule.next_change_after(now) == (None, None)
+
+    def test_overnight_range(self, models, use_rules):
+        """An overnight rule holds past midnight; a gap without rules keeps the status."""
+        use_rules(
+            self._rule(models, 1, '09:00', '18:00'),
+            self._rule(models, 2, '22:00', '06:00'),
+        )
+        now = datetime(2026, 1, 5, 23, 0, tzinfo=models._tz)
+
+        assert models.Schedule.next_change_after(now) == (
+            datetime(2026, 1, 6, 9, 0, tzinfo=models._tz), 1
+        )
+
+    def test_override_end_is_inclusive(self, models, use_rules):
+        """An override ending at 12:00 still applies at 12:00, so the change is at 12:01."""
+        use_rules(
+            self._rule(models, 1, '00:00', '23:59'),
+            self._rule(models, 9, '10:00', '12:00', priority=models.PRIORITY_OVERRIDE,
+                       date_start='05.01.2026', date_end='05.01.2026'),
+        )
+        now = datetime(2026, 1, 5, 11, 0, tzinfo=models._tz)
+
+        assert models.Schedule.next_change_after(now) == (
+            datetime(2026, 1, 5, 12, 1, tzinfo=models._tz), 1
+        )
+
+    def test_midnight_rollover(self, models, use_rules):
+        """A rule that only starts matching on a new day is found at midnight."""
+        # Tuesday-only overnight rule: matches Tue 00:00-06:00, not Mon night
+        use_rules(self._rule(models, 2, '22:00', '06:00', days=[1]))
+        now = datetime(2026, 1, 5, 23, 0, tzinfo=models._tz)  # Monday
+
+        assert models.Schedule.next_change_after(now) == (
+            datetime(2026, 1, 6, 0, 0, tzinfo=models._tz), 2
+        )
+
+    def test_horizon(self, models, use_rules):
+        """Changes beyond horizon_days (8 by default) are not reported."""
+        use_rules(
+            self._rule(models, 1, '00:00', '23:59'),
+            self._rule(models, 9, '00:00', '23:59', priority=models.PRIORITY_OVERRIDE,
+                       date_start='15.01.2026', date_end='20.01.2026'),
+        )
+        now = datetime(2026, 1, 5, 12, 0, tzinfo=models._tz)
+
+        assert models.Schedule.next_change_after(now) == (None, 1)
+        assert models.Schedule.next_change_after(now, horizon_days=12) == (
+            datetime(2026, 1, 15, 0, 0, tzinfo=models._tz), 9
+        )
+
+    def test_dst_transition(self, models, use_rules, monkeypatch):
+        """Boundaries across a DST switch land on the local wall-clock time."""
+        monkeypatch.setattr(models, '_tz', ZoneInfo('Europe/Berlin'))
+        use_rules(
+            self._rule(models, 1, '09:00', '18:00'),
+            self._rule(models, 2, '18:00', '09:00'),
+        )
+        now = models.get_now().replace(year=2026, month=3, day=28, hour=23, minute=0,
+                                       second=0, microsecond=0)  # CET, before the switch
+
+        when, emoji_id = models.Schedule.next_change_after(now)
+
+        assert (when, emoji_id) == (datetime(2026, 3, 29, 9, 0, tzinfo=models._tz), 1)
+        assert when.utcoffset() == timedelta(hours=2)
+        # Only 9 real hours pass, since clocks skip 02:00-03:00
+        assert when.astimezone(timezone.utc) - now.astimezone(timezone.utc) == timedelta(hours=9)
+
+
+class TestModelCaches:
+    """Tests for the Settings, Reply and Schedule read caches."""
+
+    @pytest.fixture
+    def models(self, load_module, monkeypatch):
+        """models with a controllable monotonic clock."""
+        models = load_module('models')
+        self.clock = 1000.0
+        monkeypatch.setattr(models, 'time', MagicMock(monotonic=lambda: self.clock))
+        return models
+
+    def _row(self, models, cls, **fields):
+        row = cls()
+        for name, value in fields.items():
+            setattr(row, name, value)
+        return row
+
+    def test_settings_cached_until_ttl(self, models, monkeypatch):
+        """Settings.get() reads the database once per key until the TTL passes."""
+        select = MagicMock(return_value=self._row(models, models.Settings, key='k', value='v'))
+        monkeypatch.setattr(models.Settings, 'selectOne', select)
+
+        assert models.Settings.get('k') == 'v'
+        assert models.Settings.get('k') == 'v'
+        assert select.call_count == 1
+
+        self.clock += models.SETTINGS_CACHE_TTL + 1
+        models.Settings.get('k')
+        assert select.call_count == 2
+
+    def test_settings_write_invalidates(self, models, monkeypatch):
+        """Saving or deleting a setting row drops its cached value."""
+        row = self._row(models, models.Settings, key='k', value='v')
+        select = MagicMock(return_value=row)
+        monkeypatch.setattr(models.Settings, 'selectOne', select)
+
+        models.Settings.get('k')
+        row.value = 'w'
+        row.save()
+        assert models.Settings.get('k') == 'w'
+
+        row.delete()
+        models.Settings.get('k')
+        assert select.call_count == 3
+
+    def test_settings_set_writes_through(self, models, monkeypatch):
+        """Settings.set() updates the cache, so get() needs no query."""
+        select = MagicMock(return_value=None)
+        monkeypatch.setattr(models.Settings, 'selectOne', select)
+
+        models.Settings.set('k', 'v')
+
+        assert models.Settings.get('k') == 'v'
+        assert select.call_count == 1
+
+    def test_reply_miss_cached_until_ttl(self, models, monkeypatch):
+        """A missing reply is cached too, until the TTL passes."""
+        select = MagicMock(return_value=None)
+        monkeypatch.setattr(models.Reply, 'selectOne', select)
+
+        assert models.Reply.get_by_emoji(42) is None
+        assert models.Reply.get_by_emoji('42') is None
+        assert select.call_count == 1
+
+        self.clock += models.REPLY_CACHE_TTL + 1
+        models.Reply.get_by_emoji(42)
+        assert select.call_count == 2
+
+    def test_reply_write_invalidates(self, models, monkeypatch):
+        """Saving or deleting any reply drops all cached lookups."""
+        reply = self._row(models, models.Reply, emoji='42')
+        select = MagicMock(return_value=None)
+        monkeypatch.setattr(models.Reply, 'selectOne', select)
+
+        models.Reply.get_by_emoji(42)
+        select.return_value = reply
+        reply.save()
+        assert models.Reply.get_by_emoji(42) is reply
+
+        reply.delete()
+        models.Reply.get_by_emoji(42)
+        assert select.call_count == 3
+
+    def test_reply_create_failed_save_keeps_cache(self, models, monkeypatch):
+        """Reply.create() edits its own row, so a failed save leaves the cached reply intact."""
+        monkeypatch.setattr(models.Reply, 'selectOne', MagicMock(
+            side_effect=lambda sql: self._row(models, models.Reply, emoji='42', _message=b'old')
+        ))
+        cached = models.Reply.get_by_emoji(42)
+        monkeypatch.setattr(models.Model, 'save', MagicMock(side_effect=RuntimeError("disk full")))
+        msg = MagicMock()
+        msg._bytes.return_value = b'new'
+
+        with pytest.raises(RuntimeError):
+            models.Reply.create(42, msg)
+
+        assert models.Reply.get_by_emoji(42) is cached
+        assert cached._message == b'old'
+
+    def test_schedule_cached_until_ttl_or_write(self, models, monkeypatch):
+        """Schedule.get_all() is cached briefly and dropped on any rule write."""
+        rule = self._row(models, models.Schedule, emoji_id='1', priority=0)
+        select = MagicMock(return_value=[rule])
+        monkeypatch.setattr(models.Schedule, 'select', select)
+
+        models.Schedule.get_all()
+        models.Schedule.get_all()
+        assert select.call_count == 1
+
+        self.clock += models.SCHEDULE_CACHE_TTL + 1
+        models.Schedule.get_all()
+        assert select.call_count == 2
+
+        rule.save()
+        models.Schedule.get_all()
+        assert select.call_count == 3
+
+    def test_schedule_rules_are_copies(self, models, monkeypatch):
+        """Editing a returned rule doesn't change the cached one."""
+        rule = self._row(models, models.Schedule, emoji_id='1', priority=0)
+        monkeypatch.setattr(models.Schedule, 'select', MagicMock(return_value=[rule]))
+
+        models.Schedule.get_all()[0].emoji_id = '2'
+
+        assert models.Schedule.get_all()[0].emoji_id == '1'
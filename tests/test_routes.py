@@ -350,6 +350,33 @@ class TestPrefixMiddlewareLogic:
         assert scope['root_path'] == ''  # Should not be modified
 
 
+class TestWrapPrefix:
+    """Tests for wrap_prefix() on the real middleware."""
+
+    @pytest.fixture
+    def main_module(self, load_module):
+        return load_module('main')
+
+    @pytest.mark.parametrize('prefix', ['', '/', None])
+    def test_empty_prefix_returns_app(self, main_module, prefix):
+        """Without a prefix the app is not wrapped."""
+        asgi_app = AsyncMock()
+        assert main_module.wrap_prefix(asgi_app, prefix) is asgi_app
+
+    @pytest.mark.asyncio
+    async def test_prefix_sets_root_path(self, main_module):
+        """With a prefix, HTTP requests get root_path without the trailing slash."""
+        asgi_app = AsyncMock()
+        wrapped = main_module.wrap_prefix(asgi_app, '/telegram-assistant/')
+        scope = {'type': 'http', 'root_path': ''}
+
+        await wrapped(scope, None, None)
+
+        assert isinstance(wrapped, main_module.PrefixMiddleware)
+        assert scope['root_path'] == '/telegram-assistant'
+        asgi_app.assert_awaited_once_with(scope, None, None)
+
+
 class TestSessionHandling:
     """Tests for session data handling logic."""
 
@@ -98,22 +98,21 @@ class TestAutoReplyServiceShouldSendReply:
 class TestAutoReplyServiceDefaultReply:
     """Tests covering the default (no-emoji-status) auto-reply behavior."""
 
-    def _make_service(self, work_emoji_id):
-        # test_caldav_service.py replaces services.autoreply_service with a
-        # MagicMock via sys.modules; that pollution can persist across files,
-        # so force a fresh real import here.
-        sys.modules.pop('services.autoreply_service', None)
-        import services.autoreply_service as ars
-        # Replace the Schedule reference on the module directly — this is
-        # robust against sys.modules['models'] being a MagicMock too.
-        fake_schedule = MagicMock()
-        fake_schedule.get_work_emoji_id.return_value = work_emoji_id
-        ars.Schedule = fake_schedule
-        return ars.AutoReplyService(cooldown_minutes=15)
-
-    def test_no_emoji_status_with_default_template_sends(self):
+    @pytest.fixture
+    def make_service(self, load_module):
+        """Build an AutoReplyService with a stubbed work emoji."""
+        ars = load_module('services.autoreply_service')
+
+        def make(work_emoji_id):
+            fake_schedule = MagicMock()
+            fake_schedule.get_work_emoji_id.return_value = work_emoji_id
+            ars.Schedule = fake_schedule
+            return ars.AutoReplyService(cooldown_minutes=15)
+        return make
+
+    def test_no_emoji_status_with_default_template_sends(self, make_service):
         """When emoji status is unset, a configured default template triggers a reply."""
-        service = self._make_service(work_emoji_id=None)
+        service = make_service(work_emoji_id=None)
         result = service.should_send_reply(
             emoji_status_id=None,
             reply_exists=True,
@@ -121,9 +120,9 @@ class TestAutoReplyServiceDefaultReply:
         )
         assert result is True
 
-    def test_no_emoji_status_without_default_template_skips(self):
+    def test_no_emoji_status_without_default_template_skips(self, make_service):
         """When emoji status is unset and no default template exists, skip."""
-        service = self._make_service(work_emoji_id=None)
+        service = make_service(work_emoji_id=None)
         result = service.should_send_reply(
             emoji_status_id=None,
             reply_exists=False,
@@ -131,9 +130,9 @@ class TestAutoReplyServiceDefaultReply:
         )
         assert result is False
 
-    def test_work_emoji_check_skipped_when_no_emoji_status(self):
+    def test_work_emoji_check_skipped_when_no_emoji_status(self, make_service):
         """Work-emoji guard does not apply when emoji_status_id is None."""
-        service = self._make_service(work_emoji_id=42)
+        service = make_service(work_emoji_id=42)
         result = service.should_send_reply(
             emoji_status_id=None,
             reply_exists=True,
@@ -141,6 +140,25 @@ class TestAutoReplyServiceDefaultReply:
         )
         assert result is True
 
+    def test_can_reply_rejects_work_emoji(self, make_service):
+        """can_reply() is False for the work emoji, before any history is needed."""
+        service = make_service(work_emoji_id=42)
+        assert service.can_reply(emoji_status_id=42, reply_exists=True) is False
+        assert service.can_reply(emoji_status_id=7, reply_exists=True) is True
+
+    def test_can_reply_rejects_missing_template(self, make_service):
+        """can_reply() is False when no reply template exists."""
+        service = make_service(work_emoji_id=None)
+        assert service.can_reply(emoji_status_id=7, reply_exists=False) is False
+
+    def test_check_rate_limit_blocks_recent_outgoing(self, make_service):
+        """check_rate_limit() blocks when we wrote within the cooldown."""
+        service = make_service(work_emoji_id=None)
+        last_outgoing = MagicMock()
+        last_outgoing.date = datetime.now(timezone.utc) - timedelta(minutes=5)
+        assert service.check_rate_limit(last_outgoing) is False
+        assert service.check_rate_limit(None) is True
+
 
 class TestAutoReplyServiceRateLimiting:
     """Tests for AutoReplyService rate limiting."""
@@ -418,6 +436,33 @@ class TestNotificationServiceWebhook:
         assert payload['message'] == "Please check ASAP"
 
 
+class TestServiceSessionClose:
+    """Tests for closing the shared HTTP sessions on shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_notification_service_close(self, load_module):
+        """close() closes the webhook session and allows a new one later."""
+        ns = load_module('services.notification_service')
+        service = ns.NotificationService(personal_tg_login='test_user')
+        session = MagicMock(closed=False, close=AsyncMock())
+        service._session = session
+
+        await service.close()
+        await service.close()
+
+        session.close.assert_awaited_once()
+        assert service._session is None
+
+    def test_services_share_close_name(self, load_module):
+        """Both HTTP-backed services are shut down through close()."""
+        ns = load_module('services.notification_service')
+        ygs = load_module('services.yandex_gpt_service')
+
+        assert callable(getattr(ns.NotificationService, 'close', None))
+        assert callable(getattr(ygs.YandexGPTService, 'close', None))
+        assert not hasattr(ns.NotificationService, 'aclose')
+
+
 class TestServiceIntegration:
     """Integration tests for services working together."""
 